@@ -8,6 +8,10 @@ __version__ = '3.0.47'
 
 import asyncio
 import concurrent.futures
+import contextlib
+import contextvars
+import copy
+import heapq
 import socket
 import certifi
 import aiohttp
@@ -19,12 +23,13 @@ from typing import Any, Optional, List
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.throttler import Throttler
+from ccxt.async_support.base.headers import ResponseHeaders
 
 # -----------------------------------------------------------------------------
 
 from ccxt.base.errors import BaseError, BadSymbol, AuthenticationError, ExchangeError, ExchangeNotAvailable, \
     RequestTimeout, \
-    NotSupported, NullResponse, InvalidOrder, InvalidAddress
+    NotSupported, NullResponse, InvalidOrder, InvalidAddress, BadResponse, BadRequest
 from ccxt.base.decimal_to_precision import TRUNCATE, ROUND, TICK_SIZE, DECIMAL_PLACES
 from ccxt.base.types import OrderType, OrderSide, IndexType, Balance
 
@@ -32,12 +37,14 @@ from ccxt.base.types import OrderType, OrderSide, IndexType, Balance
 
 from ccxt.base.exchange import Exchange as BaseExchange, ArgumentsRequired
 from ccxt.base.precise import Precise
+from ccxt.base.response_cache import bypass as response_cache_bypass
 
 # -----------------------------------------------------------------------------
 
 from ccxt.async_support.base.ws.functions import inflate, inflate64, gunzip
 from ccxt.async_support.base.ws.fast_client import FastClient
 from ccxt.async_support.base.ws.future import Future
+from ccxt.async_support.base.ws.stream import Stream, subscribing
 from ccxt.async_support.base.ws.order_book import OrderBook, IndexedOrderBook, CountedOrderBook
 
 # -----------------------------------------------------------------------------
@@ -49,16 +56,55 @@ __all__ = [
 
 # -----------------------------------------------------------------------------
 
+# the throttler priority of the job that execute_bulk() is running in the current task
+bulk_priority = contextvars.ContextVar('bulk_priority', default=None)
+# the url of the sharded connection that the exchange code got with client(url) in the current task, to authenticate
+# it or to register the id of a subscription on it, so the next watch() of that url subscribes on that connection
+direct_client = contextvars.ContextVar('direct_client', default=None)
+
 
 class Exchange(BaseExchange):
     synchronous = False
     streaming = {
         'maxPingPongMisses': 2,
-        'keepAlive': 30000
+        'keepAlive': 30000,
+        # the subscriptions to an endpoint are sharded across connections when set, a new connection is opened
+        # when the others carry maxSubscriptionsPerConnection subscriptions or maxMessageRatePerConnection messages per second
+        'maxSubscriptionsPerConnection': None,
+        'maxMessageRatePerConnection': None,
+        'maxConnectionsPerEndpoint': None,
     }
     ping = None
     newUpdates = True
     clients = {}
+    # the keyword arguments of the aiohttp.TCPConnector, like limit, limit_per_host, keepalive_timeout, ttl_dns_cache or happy_eyeballs_delay
+    aiohttpConnector = {
+        'enable_cleanup_closed': True,
+    }
+    # the throttler releases the requests of the lowest priority first
+    throttlePriorities = {
+        'trading': 0,
+        'private': 1,
+        'public': 2,
+    }
+    # the background refresh of a stale markets cache
+    marketsCacheRefresh = None
+    # the jobs of execute_bulk that run at the same time
+    bulkConcurrency = 10
+    # the concurrent identical GET requests to the public apis share one response
+    coalesceRequests = False
+    # the watch methods that return the value resolved by the client, the streams queue these values without calling the method again,
+    # the other watch methods process the resolved value, e.g. watch_trades filters the cache by since and limit
+    streamMethods = ['watch_order_book', 'watch_ticker']
+    # the exchanges with shareSession use one session (and its pool of connections) per event loop and connector config,
+    # the shared sessions do not store the cookies, so the cookies of an instance or an account do not leak to the others
+    shareSession = False
+    sharedSessions = {}
+    sharedSessionKey = None
+    # the view of the headers of the last response, copied to a dict the first time that last_response_headers is read
+    lastResponseHeadersView = None
+    # loading the certificates is slow, one ssl context per ca file is created in this process
+    ssl_contexts = {}
 
     def __init__(self, config={}):
         if 'asyncio_loop' in config:
@@ -68,13 +114,24 @@ class Exchange(BaseExchange):
         self.own_session = 'session' not in config
         self.cafile = config.get('cafile', certifi.where())
         super(Exchange, self).__init__(config)
-        self.throttle = None
-        self.init_rest_rate_limiter()
         self.markets_loading = None
         self.reloading_markets = False
+        self.requests_in_flight = {}
+        self.shardAssignments = {}  # the connection index of the subscriptions, by endpoint url
+
+    @property
+    def last_response_headers(self):
+        headers = self.lastResponseHeadersView
+        if isinstance(headers, ResponseHeaders):
+            headers = self.lastResponseHeadersView = dict(headers)
+        return headers
+
+    @last_response_headers.setter
+    def last_response_headers(self, headers):
+        self.lastResponseHeadersView = headers
 
     def init_rest_rate_limiter(self):
-        self.throttle = Throttler(self.tokenBucket, self.asyncio_loop)
+        self.throttle = Throttler(self.tokenBucket, self.asyncio_loop, self.create_rate_limit_bucket())
 
     def get_event_loop(self):
         return self.asyncio_loop
@@ -102,20 +159,66 @@ class Exchange(BaseExchange):
                 self.asyncio_loop = asyncio.get_event_loop()
             self.throttle.loop = self.asyncio_loop
         if self.own_session and self.session is None:
-            # Create our SSL context object with our CA cert file
-            context = ssl.create_default_context(cafile=self.cafile) if self.verify else self.verify
-            # Pass this SSL context to aiohttp and create a TCPConnector
-            connector = aiohttp.TCPConnector(ssl=context, loop=self.asyncio_loop, enable_cleanup_closed=True)
-            self.session = aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env)
+            if self.shareSession:
+                self.session = self.open_shared_session()
+            else:
+                self.session = self.create_session()
+
+    def get_ssl_context(self):
+        if not self.verify:
+            return self.verify
+        if self.cafile not in Exchange.ssl_contexts:
+            Exchange.ssl_contexts[self.cafile] = ssl.create_default_context(cafile=self.cafile)
+        return Exchange.ssl_contexts[self.cafile]
+
+    def create_session(self, shared=False):
+        connector = aiohttp.TCPConnector(**self.extend({
+            'ssl': self.get_ssl_context(),
+            'loop': self.asyncio_loop,
+        }, self.aiohttpConnector))
+        cookie_jar = aiohttp.DummyCookieJar(loop=self.asyncio_loop) if shared else None
+        return aiohttp.ClientSession(loop=self.asyncio_loop, connector=connector, trust_env=self.aiohttp_trust_env, cookie_jar=cookie_jar)
+
+    def session_sharing_key(self):
+        # a session is bound to its event loop, the instances with other connection settings get their own session
+        connector = tuple(sorted((key, repr(value)) for key, value in self.aiohttpConnector.items()))
+        return (self.asyncio_loop, self.cafile, bool(self.verify), self.aiohttp_trust_env, connector)
+
+    def open_shared_session(self):
+        key = self.session_sharing_key()
+        shared = Exchange.sharedSessions.get(key)
+        if shared is None or shared['session'].closed:
+            shared = Exchange.sharedSessions[key] = {
+                'session': self.create_session(True),
+                'users': 0,
+            }
+        shared['users'] += 1
+        self.sharedSessionKey = key
+        return shared['session']
 
     async def close(self):
         if self.session is not None:
             if self.own_session:
-                await self.session.close()
+                if self.sharedSessionKey is not None:
+                    await self.close_shared_session()
+                else:
+                    await self.session.close()
             self.session = None
 
-    async def fetch(self, url, method='GET', headers=None, body=None):
-        """Perform a HTTP request and return decoded JSON data"""
+    async def close_shared_session(self):
+        # the shared session is closed by the last instance that uses it
+        key = self.sharedSessionKey
+        self.sharedSessionKey = None
+        shared = Exchange.sharedSessions.get(key)
+        if shared is not None and shared['session'] is self.session:
+            shared['users'] -= 1
+            if shared['users'] > 0:
+                return
+            del Exchange.sharedSessions[key]
+        await self.session.close()
+
+    async def fetch(self, url, method='GET', headers=None, body=None, stream=False):
+        """Perform a HTTP request and return decoded JSON data, or an async iterator of the items of a JSON array if stream is True"""
         request_headers = self.prepare_request_headers(headers)
         url = self.proxy + url
 
@@ -133,24 +236,41 @@ class Exchange(BaseExchange):
         http_status_text = None
         json_response = None
         try:
-            async with session_method(yarl.URL(url, encoded=True),
-                                      data=encoded_body,
-                                      headers=request_headers,
-                                      timeout=(self.timeout / 1000),
-                                      proxy=self.aiohttp_proxy) as response:
-                http_response = await response.text(errors='replace')
-                # CIMultiDictProxy
-                raw_headers = response.headers
-                headers = {}
-                for header in raw_headers:
-                    if header in headers:
-                        headers[header] = headers[header] + ', ' + raw_headers[header]
-                    else:
-                        headers[header] = raw_headers[header]
+            async with contextlib.AsyncExitStack() as exit_stack:
+                response = await exit_stack.enter_async_context(session_method(yarl.URL(url, encoded=True),
+                                                                               data=encoded_body,
+                                                                               headers=request_headers,
+                                                                               timeout=(self.timeout / 1000),
+                                                                               proxy=self.aiohttp_proxy))
+                # a case-insensitive view of the CIMultiDictProxy instead of a copy
+                headers = ResponseHeaders(response.headers)
                 http_status_code = response.status
                 http_status_text = response.reason
-                http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
-                json_response = self.parse_json(http_response)
+                if self.enableRateLimit:
+                    self.handle_rate_limit_headers(http_status_code, http_status_text, url, method, headers)
+                if stream:
+                    first_chunk = await response.content.read(self.streamChunkSize)
+                    if self.is_json_array_stream(http_status_code, headers, first_chunk):
+                        if self.enableLastResponseHeaders:
+                            self.last_response_headers = headers
+                        if self.verbose:
+                            self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", headers, "ResponseBody: (streamed)")
+                        # the error checks see the status and the headers before the first item, the body is not read yet
+                        self.handle_errors(http_status_code, http_status_text, url, method, headers, '', None, request_headers, request_body)
+                        self.handle_http_status_code(http_status_code, http_status_text, url, method, '')
+                        # the response is released by the iterator once its items are read
+                        return self.read_json_array(exit_stack.pop_all(), response, first_chunk, url)
+                    http_body = first_chunk + await response.content.read()
+                else:
+                    http_body = await response.read()
+                if self.is_json_bytes_response(http_status_code, headers, http_body):
+                    # the json is decoded from the bytes and the text of the response is never materialized
+                    http_response = ''
+                    json_response = self.parse_json(http_body)
+                else:
+                    http_response = http_body.decode(response.get_encoding(), errors='replace')
+                    http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_response, request_headers, request_body)
+                    json_response = self.parse_json(http_response)
                 if self.enableLastHttpResponse:
                     self.last_http_response = http_response
                 if self.enableLastResponseHeaders:
@@ -185,17 +305,96 @@ class Exchange(BaseExchange):
             return http_response
         return response.content
 
+    async def read_json_array(self, exit_stack, response, chunk, url):
+        # the parse_* methods are synchronous, so the items are decoded while the chunks are downloaded,
+        # only one chunk of the body and the items that it completes are kept in memory at a time
+        async with exit_stack:
+            array = self.json_decoder.array_decoder(self.quoteJsonNumbers)
+            try:
+                for item in array.feed(chunk):
+                    yield item
+                while not array.done:
+                    chunk = await response.content.read(self.streamChunkSize)
+                    for item in array.feed(chunk, not chunk):
+                        yield item
+            except ValueError as e:
+                raise BadResponse(self.id + ' malformed json array response: ' + str(e)) from e
+            except (concurrent.futures.TimeoutError, asyncio.TimeoutError) as e:
+                raise RequestTimeout(self.id + ' ' + url) from e
+            except aiohttp.ClientError as e:
+                raise ExchangeNotAvailable(self.id + ' ' + url) from e
+
+    def is_json_bytes_response(self, code, headers, body):
+        # the text is still needed for the error statuses, the verbose mode, the last http response and the exchanges that override on_rest_response or on_json_response
+        if not self.decodeJsonFromBytes or code >= 400 or self.verbose or self.enableLastHttpResponse:
+            return False
+        if type(self).on_rest_response is not BaseExchange.on_rest_response or type(self).on_json_response is not BaseExchange.on_json_response:
+            return False
+        return headers.get('Content-Type', '').startswith('application/json') and (len(body) >= 2) and (body[:1] == b'{' or body[:1] == b'[')
+
     async def load_markets_helper(self, reload=False, params={}):
         if not reload:
             if self.markets:
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
-        currencies = None
-        if self.has['fetchCurrencies'] is True:
-            currencies = await self.fetch_currencies()
-        markets = await self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+            if self.shareMarkets:
+                return await self.load_shared_markets(params)
+        return await self.load_markets_tables(reload, params)
+
+    async def load_markets_tables(self, reload=False, params={}):
+        cache_path = self.markets_cache_path()
+        if not reload and cache_path and self.restore_markets_cache(cache_path, params):
+            return self.markets
+        # a reload does not read the markets from the response cache
+        token = response_cache_bypass.set(reload)
+        try:
+            currencies = None
+            if self.has['fetchCurrencies'] is True:
+                currencies = await self.fetch_currencies()
+            markets = await self.fetch_markets(params)
+        finally:
+            response_cache_bypass.reset(token)
+        result = self.set_markets(markets, currencies)
+        if cache_path:
+            self.write_markets_cache(cache_path, markets, currencies)
+        if self.shareMarkets:
+            self.register_shared_markets(self.shared_markets_key())
+        return result
+
+    async def load_shared_markets(self, params={}):
+        key = self.shared_markets_key()
+        if key not in self.shared_markets:
+            # the instances loading the same markets await the first one instead of fetching them again
+            loading = self.shared_markets_loading.get(key)
+            if loading is None:
+                loading = asyncio.ensure_future(self.load_markets_tables(False, params))
+                self.shared_markets_loading[key] = loading
+                loading.add_done_callback(lambda future: self.shared_markets_loading.pop(key, None))
+            await loading
+        self.restore_shared_markets(key)
+        return self.markets
+
+    def refresh_markets_cache(self, params={}):
+        cache_path = self.markets_cache_path()
+
+        async def refresh():
+            response_cache_bypass.set(True)  # in the context of this task only
+            try:
+                currencies = None
+                if self.has['fetchCurrencies'] is True:
+                    currencies = await self.fetch_currencies()
+                markets = await self.fetch_markets(params)
+                # set_markets is synchronous, so the other coroutines never see partially updated markets
+                self.set_markets(markets, currencies)
+                self.write_markets_cache(cache_path, markets, currencies)
+            except Exception as e:
+                self.logger.warning('%s failed to refresh the stale markets cache: %s', self.id, e)
+
+        # the task is referenced until it is done, the event loop only keeps a weak reference to it
+        if self.marketsCacheRefresh is None or self.marketsCacheRefresh.done():
+            self.marketsCacheRefresh = asyncio.ensure_future(refresh())
+        return self.marketsCacheRefresh
 
     async def load_markets(self, reload=False, params={}):
         if (reload and not self.reloading_markets) or not self.markets_loading:
@@ -254,6 +453,68 @@ class Exchange(BaseExchange):
     async def sleep(self, milliseconds):
         return await asyncio.sleep(milliseconds / 1000)
 
+    async def execute_bulk(self, jobs, concurrency=None, timeout=None):
+        """Runs the (method, args) jobs, or dicts with method, args, priority and timeout, concurrency at a time,
+        the results are in the order of the jobs with the exception of each failed job instead of its result"""
+        concurrency = self.bulkConcurrency if concurrency is None else concurrency
+        if concurrency <= 0:
+            raise BadRequest(self.id + ' execute_bulk() requires a concurrency greater than 0')
+        queue = []
+        for index, job in enumerate(jobs):
+            if isinstance(job, dict):
+                method = job['method']
+                args = job.get('args', [])
+                priority = job.get('priority')
+                job_timeout = job.get('timeout', timeout)
+            else:
+                method, args = job
+                priority = None
+                job_timeout = timeout
+            priority = self.job_priority(method) if priority is None else self.throttle_priority(priority)
+            # the jobs without a priority start after the private requests, the throttler gives them the priority of their endpoints
+            order = self.throttlePriorities['private'] if priority is None else priority
+            heapq.heappush(queue, (order, index, method, args, priority, job_timeout))
+        results = [None] * len(queue)
+
+        async def worker():
+            while queue:
+                order, index, method, args, priority, job_timeout = heapq.heappop(queue)
+                try:
+                    results[index] = await self.execute_job(method, args, job_timeout, priority)
+                except Exception as e:
+                    results[index] = e
+
+        await asyncio.gather(*[worker() for _ in range(min(concurrency, len(queue)))])
+        return results
+
+    def throttle_priority(self, priority):
+        # a name of throttlePriorities or a number, the lower the sooner
+        if isinstance(priority, str):
+            if priority not in self.throttlePriorities:
+                raise BadRequest(self.id + ' priority ' + priority + ' is not one of ' + ', '.join(self.throttlePriorities.keys()))
+            return self.throttlePriorities[priority]
+        return priority
+
+    def job_priority(self, method):
+        # the orders are placed and cancelled before the other jobs, the other ones have the priority of their requests
+        return self.throttlePriorities['trading'] if method.startswith(('create', 'cancel', 'edit')) else None
+
+    async def execute_job(self, method, args, timeout=None, priority=None):
+        function = getattr(self, method, None)
+        if function is None:
+            raise NotSupported(self.id + ' ' + method + '() is not supported')
+        # the requests of the job are queued by the throttler with its priority
+        token = bulk_priority.set(priority)
+        try:
+            if timeout is None:
+                return await function(*args)
+            try:
+                return await asyncio.wait_for(function(*args), timeout / 1000)
+            except asyncio.TimeoutError as e:
+                raise RequestTimeout(self.id + ' ' + method + '() timed out after ' + str(timeout) + ' ms') from e
+        finally:
+            bulk_priority.reset(token)
+
     async def spawn_async(self, method, *args):
         try:
             await method(*args)
@@ -305,9 +566,16 @@ class Exchange(BaseExchange):
     def counted_order_book(self, snapshot={}, depth=None):
         return CountedOrderBook(snapshot, depth)
 
-    def client(self, url):
+    def client(self, url, shard=None):
+        """The connection to url, the first one unless a shard index is given, the sharded connections
+        after the first one are only used by watch() for the subscriptions that are assigned to them"""
         self.clients = self.clients or {}
-        if url not in self.clients:
+        if self.streaming.get('maxSubscriptionsPerConnection'):
+            if shard is None:
+                direct_client.set(url)
+                shard = 0
+        key = url if not shard else (url, shard)
+        if key not in self.clients:
             on_message = self.handle_message
             on_error = self.on_error
             on_close = self.on_close
@@ -319,10 +587,92 @@ class Exchange(BaseExchange):
                 'ping': getattr(self, 'ping', None),
                 'verbose': self.verbose,
                 'throttle': Throttler(self.tokenBucket, self.asyncio_loop),
+                'json_decoder': self.json_decoder,
                 'asyncio_loop': self.asyncio_loop,
+                'shard': shard,
             }, ws_options)
-            self.clients[url] = FastClient(url, on_message, on_error, on_close, on_connected, options)
-        return self.clients[url]
+            self.clients[key] = FastClient(url, on_message, on_error, on_close, on_connected, options)
+        return self.clients[key]
+
+    def client_key(self, client):
+        return client.url if not client.shard else (client.url, client.shard)
+
+    def shard(self, url, subscription_hash, assign=True):
+        """The index of the connection to url that carries the subscription, None if the connections are not sharded"""
+        limit = self.streaming.get('maxSubscriptionsPerConnection')
+        if not limit:
+            return None
+        assignments = self.shardAssignments.setdefault(url, {})
+        if subscription_hash in assignments:
+            return assignments[subscription_hash]
+        if direct_client.get() == url:
+            # the exchange code prepared (or authenticated) the first connection for the next subscription
+            if assign:
+                direct_client.set(None)
+                assignments[subscription_hash] = 0
+            return 0
+        if not assign:
+            # a future without a subscription, like a response, is resolved by the connection that waits for it,
+            # the requests that are not subscriptions are sent on the first connection
+            for client in self.shard_clients(url):
+                if (subscription_hash in client.futures) or (subscription_hash in client.subscriptions):
+                    return client.shard
+            return 0
+        loads = self.shard_loads(url)
+        max_rate = self.streaming.get('maxMessageRatePerConnection')
+        max_connections = self.streaming.get('maxConnectionsPerEndpoint')
+        available = [index for index, load in loads.items() if (load['subscriptions'] < limit) and (not max_rate or load['rate'] < max_rate)]
+        if available:
+            shard = min(available, key=lambda index: (loads[index]['subscriptions'], loads[index]['rate']))
+        elif not max_connections or len(loads) < max_connections:
+            shard = next(index for index in range(len(loads) + 1) if index not in loads)
+        else:
+            # all the connections are over their limits, the least loaded one carries the subscription
+            shard = min(loads, key=lambda index: (loads[index]['subscriptions'], loads[index]['rate']))
+        assignments[subscription_hash] = shard
+        return shard
+
+    def shard_clients(self, url):
+        return [client for client in (self.clients or {}).values() if client.url == url]
+
+    def shard_loads(self, url):
+        loads = {}
+        for shard in self.shardAssignments.get(url, {}).values():
+            if shard not in loads:
+                client = self.clients.get(url if not shard else (url, shard)) if self.clients else None
+                loads[shard] = {
+                    'subscriptions': 0,
+                    'rate': self.client_message_rate(client) if client else 0,
+                }
+            loads[shard]['subscriptions'] += 1
+        return loads
+
+    def client_message_rate(self, client):
+        # the messages per second since the connection was established
+        if not client.connectionEstablished:
+            return 0
+        return client.messages * 1000 / max(self.milliseconds() - client.connectionEstablished, 1)
+
+    def release_shard(self, client):
+        # the subscriptions of a connection that is gone are assigned again when they are watched, to the least loaded connections
+        assignments = self.shardAssignments.get(client.url, {})
+        for subscription_hash in [key for key, shard in assignments.items() if shard == client.shard]:
+            del assignments[subscription_hash]
+
+    def connection_load(self):
+        """The subscriptions, the messages and the message rate of each connection"""
+        result = []
+        for client in (self.clients or {}).values():
+            assignments = self.shardAssignments.get(client.url, {})
+            result.append({
+                'url': client.url,
+                'shard': client.shard,
+                'connected': client.isConnected,
+                'subscriptions': len(client.subscriptions) if client.shard is None else list(assignments.values()).count(client.shard),
+                'messages': client.messages,
+                'rate': self.client_message_rate(client),
+            })
+        return result
 
     def delay(self, timeout, method, *args):
         return self.asyncio_loop.call_later(timeout / 1000, self.spawn, method, *args)
@@ -335,7 +685,10 @@ class Exchange(BaseExchange):
 
     def watch(self, url, message_hash, message=None, subscribe_hash=None, subscription=None):
         backoff_delay = 0
-        client = self.client(url)
+        client = self.client(url, self.shard(url, message_hash if subscribe_hash is None else subscribe_hash, subscribe_hash is not None))
+        stream = subscribing.get()
+        if stream is not None:
+            stream.watched(client, message_hash)
         if subscribe_hash is None and message_hash in client.futures:
             return client.futures[message_hash]
         future = client.future(message_hash)
@@ -366,14 +719,30 @@ class Exchange(BaseExchange):
 
         return future
 
+    def create_stream(self, method, *args, size=1, transform=None):
+        """An async iterator over the results of one of the streamMethods, e.g. create_stream('watch_ticker', symbol), the first result
+        is returned by the method, the next ones are the values that the client resolves, passed through transform, the results
+        that arrive between the iterations are queued up to size, the oldest ones are skipped, use it with async with"""
+        if method not in self.streamMethods:
+            raise NotSupported(self.id + ' create_stream() does not support ' + method + '(), only ' + ', '.join(self.streamMethods))
+        return Stream(lambda: getattr(self, method)(*args), transform, size)
+
+    def stream_order_book(self, symbol, limit=None, params={}, size=1):
+        return self.create_stream('watch_order_book', symbol, limit, params, size=size, transform=lambda orderbook: orderbook.limit())
+
+    def stream_ticker(self, symbol, params={}, size=1):
+        return self.create_stream('watch_ticker', symbol, params, size=size)
+
     def on_connected(self, client, message=None):
         # for user hooks
         # print('Connected to', client.url)
         pass
 
     def on_error(self, client, error):
-        if client.url in self.clients and self.clients[client.url].error:
-            del self.clients[client.url]
+        key = self.client_key(client)
+        if key in self.clients and self.clients[key] is client and client.error:
+            del self.clients[key]
+            self.release_shard(client)
 
     def on_close(self, client, error):
         if client.error:
@@ -381,14 +750,25 @@ class Exchange(BaseExchange):
             pass
         else:
             # server disconnected a working connection
-            if client.url in self.clients:
-                del self.clients[client.url]
+            key = self.client_key(client)
+            if key in self.clients and self.clients[key] is client:
+                del self.clients[key]
+                self.release_shard(client)
+
+    def conflation_stats(self):
+        """The skipped updates, the queued ones and the staleness of the conflated subscriptions by messageHash"""
+        result = {}
+        for client in self.clients.values():
+            for message_hash in client.conflated:
+                result[message_hash] = client.conflation_stats(message_hash)
+        return result
 
     async def ws_close(self):
         if self.clients:
             await asyncio.wait([asyncio.create_task(client.close()) for client in self.clients.values()], return_when=asyncio.ALL_COMPLETED)
             for url in self.clients.copy():
                 del self.clients[url]
+            self.shardAssignments = {}
         await super(Exchange, self).close()
 
     async def load_order_book(self, client, messageHash, symbol, limit=None, params={}):
@@ -411,7 +791,7 @@ class Exchange(BaseExchange):
                     return
                 tries += 1
             client.reject(ExchangeError(self.id + ' nonce is behind cache after ' + str(maxRetries) + ' tries.'), messageHash)
-            del self.clients[client.url]
+            del self.clients[self.client_key(client)]
         except BaseError as e:
             client.reject(e, messageHash)
             await self.load_order_book(client, messageHash, symbol, limit, params)
@@ -1523,9 +1903,8 @@ class Exchange(BaseExchange):
     def parse_trades(self, trades, market: Optional[object] = None, since: Optional[int] = None, limit: Optional[int] = None, params={}):
         trades = self.to_array(trades)
         result = []
-        for i in range(0, len(trades)):
-            trade = self.extend(self.parse_trade(trades[i], market), params)
-            result.append(trade)
+        for trade in trades:  # a list or an iterator
+            result.append(self.extend(self.parse_trade(trade, market), params))
         result = self.sort_by_2(result, 'timestamp', 'id')
         symbol = market['symbol'] if (market is not None) else None
         tail = (since is None)
@@ -1556,8 +1935,8 @@ class Exchange(BaseExchange):
     def parse_ledger(self, data, currency: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None, params={}):
         result = []
         arrayData = self.to_array(data)
-        for i in range(0, len(arrayData)):
-            itemOrItems = self.parse_ledger_entry(arrayData[i], currency)
+        for item in arrayData:  # a list or an iterator
+            itemOrItems = self.parse_ledger_entry(item, currency)
             if isinstance(itemOrItems, list):
                 for j in range(0, len(itemOrItems)):
                     result.append(self.extend(itemOrItems[j], params))
@@ -1602,12 +1981,64 @@ class Exchange(BaseExchange):
         return self.index_by(results, key) if indexed else results
 
     async def fetch2(self, path, api: Any = 'public', method='GET', params={}, headers: Optional[Any] = None, body: Optional[Any] = None, config={}, context={}):
+        stream = self.safe_value(params, 'streamResponse', False)
+        if stream:
+            params = self.omit(params, 'streamResponse')
+        cache_key = None if stream else self.response_cache_key(path, api, method, params, config)
+        if cache_key is not None and not self.safe_value(context, 'coalesced'):
+            response = self.response_cache.get(cache_key)
+            if response is not None:
+                return response
+        if not stream and self.coalesceRequests and not self.safe_value(context, 'coalesced') and self.is_public_request(api, method, headers, body):
+            return await self.fetch_coalesced(path, api, method, params, config, context)
         if self.enableRateLimit:
             cost = self.calculate_rate_limiter_cost(api, method, path, params, config, context)
-            await self.throttle(cost)
+            await self.throttle(cost, self.calculate_rate_limiter_priority(api, method, path, config, context))
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return await self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        response = await self.fetch(request['url'], request['method'], request['headers'], request['body'], stream)
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response, config['ttl'])
+        return response
+
+    def is_public_api(self, api):
+        # the apis named public and not private, like public or fapiPublic, are not signed
+        name = ' '.join(api).lower() if isinstance(api, list) else str(api).lower()
+        return 'public' in name and 'private' not in name
+
+    def is_public_request(self, api, method, headers, body):
+        return method == 'GET' and headers is None and body is None and self.is_public_api(api)
+
+    def calculate_rate_limiter_priority(self, api, method, path, config={}, context={}):
+        # the priority of the context, of the job of execute_bulk() or declared next to the cost of an endpoint, otherwise the private
+        # requests that are not GET (orders) jump ahead of the other private ones, which jump ahead of the public ones
+        priority = self.safe_value(context, 'priority')
+        if priority is None:
+            priority = bulk_priority.get()
+        if priority is None:
+            priority = self.safe_value(config, 'priority')
+        if priority is None:
+            if self.is_public_api(api):
+                priority = 'public'
+            else:
+                priority = 'private' if method == 'GET' else 'trading'
+        return self.throttle_priority(priority)
+
+    async def fetch_coalesced(self, path, api, method, params, config, context):
+        # the identical requests in flight share one round trip, every caller gets its own copy of the response like from the response cache
+        key = (path, str(api), method, self.json(params))
+        task = self.requests_in_flight.get(key)
+        if task is None:
+            self.requests_in_flight[key] = task = asyncio.ensure_future(self.fetch2(path, api, method, params, None, None, config, self.extend(context, {'coalesced': True})))
+            task.add_done_callback(lambda done: self.release_coalesced(key, done))
+        # a caller that is cancelled does not cancel the request of the others
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def release_coalesced(self, key, task):
+        if self.requests_in_flight.get(key) is task:
+            del self.requests_in_flight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, in case all the callers were cancelled
 
     async def request(self, path, api: Any = 'public', method='GET', params={}, headers: Optional[Any] = None, body: Optional[Any] = None, config={}, context={}):
         return await self.fetch2(path, api, method, params, headers, body, config, context)
@@ -1681,53 +2112,9 @@ class Exchange(BaseExchange):
         }
 
     def safe_market(self, marketId=None, market=None, delimiter=None, marketType=None):
-        result = {
-            'id': marketId,
-            'symbol': marketId,
-            'base': None,
-            'quote': None,
-            'baseId': None,
-            'quoteId': None,
-            'active': None,
-            'type': None,
-            'linear': None,
-            'inverse': None,
-            'spot': False,
-            'swap': False,
-            'future': False,
-            'option': False,
-            'margin': False,
-            'contract': False,
-            'contractSize': None,
-            'expiry': None,
-            'expiryDatetime': None,
-            'optionType': None,
-            'strike': None,
-            'settle': None,
-            'settleId': None,
-            'precision': {
-                'amount': None,
-                'price': None,
-            },
-            'limits': {
-                'amount': {
-                    'min': None,
-                    'max': None,
-                },
-                'price': {
-                    'min': None,
-                    'max': None,
-                },
-                'cost': {
-                    'min': None,
-                    'max': None,
-                },
-            },
-            'info': None,
-        }
         if marketId is not None:
-            if (self.markets_by_id is not None) and (marketId in self.markets_by_id):
-                markets = self.markets_by_id[marketId]
+            markets = self.markets_by_id.get(marketId) if (self.markets_by_id is not None) else None
+            if markets is not None:
                 numMarkets = len(markets)
                 if numMarkets == 1:
                     return markets[0]
@@ -1740,20 +2127,10 @@ class Exchange(BaseExchange):
                         if market[inferredMarketType]:
                             return market
             elif delimiter is not None:
-                parts = marketId.split(delimiter)
-                partsLength = len(parts)
-                if partsLength == 2:
-                    result['baseId'] = self.safe_string(parts, 0)
-                    result['quoteId'] = self.safe_string(parts, 1)
-                    result['base'] = self.safe_currency_code(result['baseId'])
-                    result['quote'] = self.safe_currency_code(result['quoteId'])
-                    result['symbol'] = result['base'] + '/' + result['quote']
-                    return result
-                else:
-                    return result
+                return self.safe_split_market(marketId, delimiter)
         if market is not None:
             return market
-        return result
+        return self.safe_market_structure(marketId)
 
     def check_required_credentials(self, error=True):
         keys = list(self.requiredCredentials.keys())
@@ -2273,10 +2650,9 @@ class Exchange(BaseExchange):
         #     ]
         #
         results = []
-        if isinstance(tickers, list):
-            for i in range(0, len(tickers)):
-                ticker = self.extend(self.parse_ticker(tickers[i]), params)
-                results.append(ticker)
+        if not isinstance(tickers, dict):  # a list or an iterator
+            for ticker in tickers:
+                results.append(self.extend(self.parse_ticker(ticker), params))
         else:
             marketIds = list(tickers.keys())
             for i in range(0, len(marketIds)):
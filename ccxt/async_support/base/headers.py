@@ -0,0 +1,26 @@
+from collections.abc import Mapping
+
+
+class ResponseHeaders(Mapping):
+    """A read-only view of the headers of an aiohttp response, the repeated headers are joined with commas when they are read"""
+
+    __slots__ = ('headers',)
+
+    def __init__(self, headers):
+        self.headers = headers  # CIMultiDictProxy
+
+    def __getitem__(self, key):
+        values = self.headers.getall(key)
+        return values[0] if len(values) == 1 else ', '.join(values)
+
+    def __contains__(self, key):
+        return key in self.headers
+
+    def __iter__(self):
+        return iter(dict.fromkeys(self.headers.keys()))
+
+    def __len__(self):
+        return len(dict.fromkeys(self.headers.keys()))
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -1,10 +1,11 @@
 import asyncio
 import collections
 from time import time
+from ccxt.base.throttler import TokenBucket
 
 
 class Throttler:
-    def __init__(self, config, loop=None):
+    def __init__(self, config, loop=None, bucket=None):
         self.loop = loop
         self.config = {
             'refillRate': 1.0,
@@ -13,37 +14,67 @@ class Throttler:
             'tokens': 0,
             'maxCapacity': 2000,
             'capacity': 1.0,
+            'priority': 0,
         }
         self.config.update(config)
-        self.queue = collections.deque()
+        # a queue per priority, the waiters of the lowest priority number are released first
+        self.queues = {}
         self.running = False
+        self.bucket = TokenBucket(self.config) if bucket is None else bucket
+        self.released = 0
+        self.total_wait_time = 0
+        self.max_wait_time = 0
+
+    def next_queue(self):
+        priorities = [priority for priority, queue in self.queues.items() if queue]
+        return self.queues[min(priorities)] if priorities else None
 
     async def looper(self):
-        last_timestamp = time() * 1000
-        while self.running:
-            future, cost = self.queue[0]
-            cost = self.config['cost'] if cost is None else cost
-            if self.config['tokens'] >= 0:
-                self.config['tokens'] -= cost
+        while True:
+            queue = self.next_queue()
+            if queue is None:
+                break
+            future, cost, timestamp = queue[0]
+            if not future.done():  # a waiter cancelled while queued does not use tokens
+                cost = self.config['cost'] if cost is None else cost
+                try:
+                    if self.bucket.blocking:  # the file lock of a bucket shared by processes must not block the loop
+                        delay = await asyncio.get_event_loop().run_in_executor(None, self.bucket.reserve, cost)
+                    else:
+                        delay = self.bucket.reserve(cost)
+                except Exception as e:  # a shared bucket that cannot be read fails the request instead of the looper
+                    future.set_exception(e)
+                    queue.popleft()
+                    continue
+                # sleep once for the exact delay instead of polling, the waiters that do not have to wait are released in one pass
+                if delay > 0:
+                    await asyncio.sleep(delay / 1000)
                 if not future.done():
                     future.set_result(None)
-                self.queue.popleft()
-                # context switch
-                await asyncio.sleep(0)
-                if len(self.queue) == 0:
-                    self.running = False
-            else:
-                await asyncio.sleep(self.config['delay'])
-                now = time() * 1000
-                elapsed = now - last_timestamp
-                last_timestamp = now
-                self.config['tokens'] = min(self.config['tokens'] + elapsed * self.config['refillRate'], self.config['capacity'])
+                wait_time = time() * 1000 - timestamp
+                self.released += 1
+                self.total_wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+            queue.popleft()
+        self.running = False
+
+    def stats(self):
+        return {
+            'queued': sum(len(queue) for queue in self.queues.values()),
+            'released': self.released,
+            'tokens': self.bucket.available(),
+            'averageWaitTime': self.total_wait_time / self.released if self.released else 0,
+            'maxWaitTime': self.max_wait_time,
+        }
 
-    def __call__(self, cost=None):
+    def __call__(self, cost=None, priority=None):
         future = asyncio.Future()
-        if len(self.queue) > self.config['maxCapacity']:
+        if sum(len(queue) for queue in self.queues.values()) > self.config['maxCapacity']:
             raise RuntimeError('throttle queue is over maxCapacity (' + str(int(self.config['maxCapacity'])) + '), see https://github.com/ccxt/ccxt/issues/11645#issuecomment-1195695526')
-        self.queue.append((future, cost))
+        priority = self.config['priority'] if priority is None else priority
+        if priority not in self.queues:
+            self.queues[priority] = collections.deque()
+        self.queues[priority].append((future, cost, time() * 1000))
         if not self.running:
             self.running = True
             asyncio.ensure_future(self.looper(), loop=self.loop)
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
+import collections
+import concurrent.futures
 import json
-from asyncio import sleep, ensure_future
+from asyncio import sleep, ensure_future, get_event_loop
 from aiohttp import WSMsgType
 from .functions import milliseconds, iso8601, is_json_encoded_object
 from ccxt.async_support.base.ws.client import Client
@@ -11,6 +13,11 @@ from ccxt import NetworkError, RequestTimeout
 
 class AiohttpClient(Client):
 
+    # the threads that decompress and decode the messages off the event loop, 0 to do it on the loop
+    decompressionWorkers = 0
+    decompression_pools = {}  # the thread pools by size, shared by the clients
+    decoding = None  # the messages being decoded by the pool, in the order of arrival
+
     def closed(self):
         return (self.connection is None) or self.connection.closed
 
@@ -21,22 +28,75 @@ class AiohttpClient(Client):
     def handle_text_or_binary_message(self, data):
         if self.verbose:
             self.log(iso8601(milliseconds()), 'message', data)
+        self.on_message_callback(self, self.decode_message(data))
+
+    def decode_message(self, data):
         if isinstance(data, bytes):
+            # json bytes are decoded without an intermediate string
+            if (len(data) >= 2) and (data[:1] == b'{' or data[:1] == b'['):
+                return self.json_decoder.loads(data)
             data = data.decode()
-        decoded = json.loads(data) if is_json_encoded_object(data) else data
-        self.on_message_callback(self, decoded)
+        return self.json_decoder.loads(data) if is_json_encoded_object(data) else data
+
+    def decompress_message(self, data):
+        if self.gunzip:
+            data = gunzip(data)
+        elif self.inflate:
+            data = inflate(data)
+        return self.decode_message(data)
+
+    def handle_message_in_pool(self, function, data):
+        # the messages are decoded concurrently and handled in the order of arrival
+        if self.decoding is None:
+            self.decoding = collections.deque()
+        if self.decompressionWorkers not in AiohttpClient.decompression_pools:
+            AiohttpClient.decompression_pools[self.decompressionWorkers] = concurrent.futures.ThreadPoolExecutor(self.decompressionWorkers, 'ccxt-decompression')
+        pool = AiohttpClient.decompression_pools[self.decompressionWorkers]
+        future = (self.asyncio_loop or get_event_loop()).run_in_executor(pool, function, data)
+        self.decoding.append(future)
+        future.add_done_callback(self.handle_decoded_messages)
+
+    def handle_decoded_messages(self, future):
+        while self.decoding and self.decoding[0].done():
+            decoded = self.decoding.popleft()
+            if decoded.cancelled():
+                continue
+            if decoded.exception() is not None:
+                # like a message that fails on the loop, the connection is reset and the messages after it are dropped
+                for pending in self.decoding:
+                    pending.cancel()
+                self.decoding.clear()
+                self.on_error(NetworkError(str(decoded.exception())))
+                return
+            if self.verbose:
+                self.log(iso8601(milliseconds()), 'message', decoded.result())
+            self.on_message_callback(self, decoded.result())
+
+    def reset(self, error):
+        super(AiohttpClient, self).reset(error)
+        if self.decoding:
+            self.decoding.clear()
 
     def handle_message(self, message):
         # self.log(iso8601(milliseconds()), message)
+        if message.type == WSMsgType.TEXT or message.type == WSMsgType.BINARY:
+            self.messages += 1
         if message.type == WSMsgType.TEXT:
-            self.handle_text_or_binary_message(message.data)
+            if self.decoding:
+                # after the binary messages that are still being decoded
+                self.handle_message_in_pool(self.decode_message, message.data)
+            else:
+                self.handle_text_or_binary_message(message.data)
         elif message.type == WSMsgType.BINARY:
-            data = message.data
-            if self.gunzip:
-                data = gunzip(data)
-            elif self.inflate:
-                data = inflate(data)
-            self.handle_text_or_binary_message(data)
+            if (self.decompressionWorkers and (self.gunzip or self.inflate)) or self.decoding:
+                self.handle_message_in_pool(self.decompress_message, message.data)
+            else:
+                data = message.data
+                if self.gunzip:
+                    data = gunzip(data)
+                elif self.inflate:
+                    data = inflate(data)
+                self.handle_text_or_binary_message(data)
         # autoping is responsible for automatically replying with pong
         # to a ping incoming from a server, we have to disable autoping
         # with aiohttp's websockets and respond with pong manually
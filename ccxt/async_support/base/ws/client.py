@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
 from asyncio import sleep, ensure_future, wait_for, TimeoutError
+from collections import deque
 from .functions import milliseconds, iso8601, deep_extend
 from ccxt import NetworkError, RequestTimeout, NotSupported
 from ccxt.async_support.base.ws.future import Future
+from ccxt.base.json_codec import get_json_codec
 
 
 class Client(object):
@@ -34,10 +36,23 @@ class Client(object):
     gunzip = False
     inflate = False
     throttle = None
+    json_decoder = get_json_codec()
     connecting = False
     asyncio_loop = None
     ping_looper = None
     receive_looper = None
+    dispatchBudget = None  # how many received messages are handled per event loop iteration, None for all of them
+    coalesceResolves = False  # only the latest result of a messageHash within an iteration is resolved
+    pending_resolves = None  # the latest results by messageHash while coalescing
+    # the results that arrive while nobody waits for their messageHash are conflated: None to drop them (no conflation),
+    # 'latest' to keep the latest one only, or a number to keep that many in a queue, the oldest ones are skipped,
+    # the results are not copied, a cache like an order book that is updated in place is queued once with its latest state
+    conflation = None
+    conflations = {}  # the conflation by messageHash, instead of the default one
+    conflated = {}  # the queued results and the counters by messageHash
+    streams = {}  # the streams that receive every result of their messageHash
+    shard = None  # the index of the connection among the ones to the same url, if they are sharded
+    messages = 0  # the messages received
 
     def __init__(self, url, on_message_callback, on_error_callback, on_close_callback, on_connected_callback, config={}):
         defaults = {
@@ -45,6 +60,9 @@ class Client(object):
             'futures': {},
             'subscriptions': {},
             'rejections': {},
+            'conflations': {},
+            'conflated': {},
+            'streams': {},
             'on_message_callback': on_message_callback,
             'on_error_callback': on_error_callback,
             'on_close_callback': on_close_callback,
@@ -62,6 +80,14 @@ class Client(object):
         self.connected = Future()
 
     def future(self, message_hash):
+        conflated = self.conflated.get(message_hash)
+        if conflated and conflated['results'] and message_hash not in self.rejections:
+            # the result that arrived while nobody was waiting is returned right away
+            result, timestamp = conflated['results'].popleft()
+            conflated['staleness'] = milliseconds() - timestamp
+            future = Future()
+            future.resolve(result)
+            return future
         if message_hash not in self.futures or self.futures[message_hash].cancelled():
             self.futures[message_hash] = Future()
         future = self.futures[message_hash]
@@ -73,24 +99,89 @@ class Client(object):
     def resolve(self, result, message_hash):
         if self.verbose and message_hash is None:
             self.log(iso8601(milliseconds()), 'resolve received None messageHash')
+        if self.pending_resolves is not None:
+            self.pending_resolves[message_hash] = result
+            return result
+        if message_hash in self.streams:
+            for stream in list(self.streams[message_hash]):
+                stream.push(result)
         if message_hash in self.futures:
             future = self.futures[message_hash]
             future.resolve(result)
             del self.futures[message_hash]
+            if message_hash in self.conflated:
+                self.conflated[message_hash]['staleness'] = 0
+        else:
+            self.conflate(result, message_hash)
         return result
 
+    def conflate(self, result, message_hash):
+        conflation = self.conflations.get(message_hash, self.conflation)
+        if conflation is None:
+            return
+        if message_hash not in self.conflated:
+            self.conflated[message_hash] = {
+                'results': deque(maxlen=1 if conflation == 'latest' else int(conflation)),
+                'skipped': 0,
+                'staleness': 0,
+            }
+        conflated = self.conflated[message_hash]
+        results = conflated['results']
+        if results and results[-1][0] is result:
+            # the same cache updated again, queuing it twice would return its latest state twice
+            results[-1] = (result, milliseconds())
+            conflated['skipped'] += 1
+            return
+        if len(results) == results.maxlen:
+            conflated['skipped'] += 1
+        results.append((result, milliseconds()))
+
+    def conflation_stats(self, message_hash):
+        """The updates skipped, the ones queued and the age in ms of the last result returned, for a conflated messageHash"""
+        conflated = self.conflated.get(message_hash)
+        if conflated is None:
+            return None
+        return {
+            'skipped': conflated['skipped'],
+            'queued': len(conflated['results']),
+            'staleness': conflated['staleness'],
+        }
+
+    def handle_messages(self, messages, budget):
+        # handles up to budget messages or all of them if budget is None,
+        # the futures are resolved once with the latest results if coalesceResolves is set
+        if self.coalesceResolves:
+            self.pending_resolves = {}
+        try:
+            while messages and (budget is None or budget > 0):
+                self.handle_message(messages.popleft())
+                if budget is not None:
+                    budget -= 1
+        finally:
+            pending_resolves = self.pending_resolves
+            self.pending_resolves = None
+            if pending_resolves:
+                for message_hash, result in pending_resolves.items():
+                    self.resolve(result, message_hash)
+
     def reject(self, result, message_hash=None):
         if message_hash:
+            streams = list(self.streams.pop(message_hash, []))
+            for stream in streams:
+                stream.fail(result)
             if message_hash in self.futures:
                 future = self.futures[message_hash]
                 future.reject(result)
                 del self.futures[message_hash]
-            else:
+            elif not streams:  # the streams raise it once, then subscribe again
                 self.rejections[message_hash] = result
         else:
             message_hashes = list(self.futures.keys())
             for message_hash in message_hashes:
                 self.reject(result, message_hash)
+            for message_hash in list(self.streams.keys()):
+                for stream in self.streams.pop(message_hash):
+                    stream.fail(result)
         return result
 
     async def receive_loop(self):
@@ -166,6 +257,8 @@ class Client(object):
 
     def reset(self, error):
         self.reject(error)
+        # the results queued before a reconnection are not delivered after it
+        self.conflated.clear()
 
     async def ping_loop(self):
         if self.verbose:
@@ -22,8 +22,8 @@ class FastClient(AiohttpClient):
             if not self.stack:
                 self.callback_scheduled = False
                 return
-            message = self.stack.popleft()
-            self.handle_message(message)
+            # the queued messages are handled in batches of dispatchBudget if it is set, one batch per iteration of the event loop
+            self.handle_messages(self.stack, self.dispatchBudget)
             self.asyncio_loop.call_soon(handler)
 
         def feed_data(message, size):
@@ -37,8 +37,8 @@ class FastClient(AiohttpClient):
 
         def wrapper(func):
             def parse_frame(buf):
-                while self.stack:
-                    self.handle_message(self.stack.popleft())
+                # the messages queued before this chunk are handled first, within the same budget as the handler
+                self.handle_messages(self.stack, self.dispatchBudget)
                 return func(buf)
             return parse_frame
 
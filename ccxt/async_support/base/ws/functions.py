@@ -1,9 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from zlib import decompress, MAX_WBITS
+import gzip
+from zlib import decompress, decompressobj, MAX_WBITS
 from base64 import b64decode
-from gzip import GzipFile
-from io import BytesIO
 import time
 import datetime
 
@@ -17,7 +16,13 @@ def inflate64(data):
 
 
 def gunzip(data):
-    return GzipFile('', 'rb', 9, BytesIO(data)).read().decode('utf-8')
+    # one zlib call with the gzip header, instead of a GzipFile over a BytesIO per message,
+    # the payloads of several members or padded with zeroes are decompressed like a GzipFile does
+    decompressor = decompressobj(16 + MAX_WBITS)
+    result = decompressor.decompress(data)
+    if decompressor.unused_data or not decompressor.eof:
+        result = gzip.decompress(data)
+    return result.decode('utf-8')
 
 
 #  Tmp : added methods below to avoid circular imports between exchange.py and aiohttp.py
@@ -0,0 +1,96 @@
+import contextvars
+import weakref
+from collections import deque
+from ccxt.async_support.base.ws.future import Future
+
+# the stream that is subscribing in the current task, Exchange.watch tells it the client and the messageHash
+subscribing = contextvars.ContextVar('subscribing', default=None)
+
+
+class Stream:
+    """An async iterator over the results of a subscription, the first one is returned by the watch method,
+    the next ones are queued by the client without a future per result, the oldest are skipped beyond size,
+    use it with async with or call close() to stop queuing, the client only keeps a weak reference to it"""
+
+    def __init__(self, subscribe, transform=None, size=1):
+        self.subscribe = subscribe  # a coroutine function that calls the watch method
+        self.transform = transform
+        self.results = deque(maxlen=size)
+        self.skipped = 0
+        self.waiter = None
+        self.error = None
+        self.client = None
+        self.message_hash = None
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __anext__(self):
+        if self.client is None:
+            return await self.subscribe_once()
+        while not self.results:
+            if self.error is not None:
+                # the next iteration subscribes again, like a watch method called after an error
+                error = self.error
+                self.close()
+                raise error
+            # a waiter is only created when the results are consumed faster than they arrive
+            self.waiter = Future()
+            await self.waiter
+        result = self.results.popleft()
+        return self.transform(result) if self.transform else result
+
+    async def subscribe_once(self):
+        token = subscribing.set(self)
+        try:
+            result = await self.subscribe()
+        except BaseException:
+            self.client = None
+            raise
+        finally:
+            subscribing.reset(token)
+        if self.client is None:
+            raise RuntimeError('the method of the stream did not call watch()')
+        self.error = None
+        # a stream that is dropped without close() is removed when it is garbage collected
+        self.client.streams.setdefault(self.message_hash, weakref.WeakSet()).add(self)
+        return result
+
+    def watched(self, client, message_hash):
+        # the first watch() of the subscription is the one that delivers its results
+        if self.client is None:
+            self.client = client
+            self.message_hash = message_hash
+
+    def push(self, result):
+        if len(self.results) == self.results.maxlen:
+            self.skipped += 1
+        self.results.append(result)
+        if self.waiter is not None:
+            self.waiter.resolve()
+            self.waiter = None
+
+    def fail(self, error):
+        self.error = error
+        if self.waiter is not None:
+            self.waiter.resolve()
+            self.waiter = None
+
+    def close(self):
+        if self.client is not None:
+            streams = self.client.streams.get(self.message_hash)
+            if streams is not None:
+                streams.discard(self)
+                if not streams:
+                    del self.client.streams[self.message_hash]
+            self.client = None
+        self.results.clear()
+
+    async def aclose(self):
+        self.close()
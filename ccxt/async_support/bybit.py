@@ -238,7 +238,7 @@ class bybit(Exchange):
                         'v5/market/mark-price-kline': 1,
                         'v5/market/index-price-kline': 1,
                         'v5/market/premium-index-price-kline': 1,
-                        'v5/market/instruments-info': 1,
+                        'v5/market/instruments-info': {'cost': 1, 'ttl': 60000},
                         'v5/market/orderbook': 1,
                         'v5/market/tickers': 1,
                         'v5/market/funding/history': 1,
@@ -246,7 +246,7 @@ class bybit(Exchange):
                         'v5/market/open-interest': 1,
                         'v5/market/historical-volatility': 1,
                         'v5/market/insurance': 1,
-                        'v5/market/risk-limit': 1,
+                        'v5/market/risk-limit': {'cost': 1, 'ttl': 60000},
                         'v5/market/delivery-price': 1,
                         'v5/spot-lever-token/info': 1,
                         'v5/spot-lever-token/reference': 1,
@@ -7778,6 +7778,18 @@ class bybit(Exchange):
                 headers['Referer'] = brokerId
         return {'url': url, 'method': method, 'body': body, 'headers': headers}
 
+    def handle_rate_limit_headers(self, code, reason, url, method, headers):
+        super(bybit, self).handle_rate_limit_headers(code, reason, url, method, headers)
+        # the limit status is the number of requests left to the endpoint until the reset timestamp,
+        # the other endpoints have their own limits, so the rate limiter only waits when none are left
+        remaining = self.parse_number(self.get_response_header(headers, 'X-Bapi-Limit-Status'))
+        if (remaining is not None) and (remaining <= 0):
+            resetTimestamp = self.parse_number(self.get_response_header(headers, 'X-Bapi-Limit-Reset-Timestamp'))
+            if resetTimestamp is not None:
+                delay = resetTimestamp - self.milliseconds()
+                if delay > 0:
+                    self.pause_rate_limiter(delay)
+
     def handle_errors(self, httpCode, reason, url, method, headers, body, response, requestHeaders, requestBody):
         if not response:
             return  # fallback to default error handler
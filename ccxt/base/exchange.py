@@ -21,6 +21,7 @@ from ccxt.base.errors import ArgumentsRequired
 from ccxt.base.errors import BadSymbol
 from ccxt.base.errors import NullResponse
 from ccxt.base.errors import RateLimitExceeded
+from ccxt.base.errors import BadResponse
 
 # -----------------------------------------------------------------------------
 
@@ -29,6 +30,9 @@ from ccxt.base.decimal_to_precision import DECIMAL_PLACES, TICK_SIZE, NO_PADDING
 from ccxt.base.decimal_to_precision import number_to_string
 from ccxt.base.precise import Precise
 from ccxt.base.types import Balance, IndexType, OrderSide, OrderType
+from ccxt.base.throttler import Throttler, TokenBucket, FileTokenBucket
+from ccxt.base.response_cache import ResponseCache, bypass as response_cache_bypass
+from ccxt.base.json_codec import get_json_codec
 
 # -----------------------------------------------------------------------------
 
@@ -64,27 +68,35 @@ import base64
 import binascii
 import calendar
 import collections
+import copy
 import datetime
 from email.utils import parsedate
+from http.cookiejar import DefaultCookiePolicy
 import functools
 import gzip
 import hashlib
 import hmac
+import itertools
 import io
 import json
 import math
+import os
 import random
 from numbers import Number
 import re
 from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.utils import default_user_agent
 from requests.exceptions import HTTPError, Timeout, TooManyRedirects, RequestException, ConnectionError as requestsConnectionError
 # import socket
 from ssl import SSLError
 # import sys
+import tempfile
+import threading
 import time
 import uuid
 import zlib
+from urllib3.util.retry import Retry
 from decimal import Decimal
 from time import mktime
 from wsgiref.handlers import format_date_time
@@ -93,6 +105,11 @@ from typing import Any, Optional, List
 
 # -----------------------------------------------------------------------------
 
+# placeholder instance for the methods bound in the cached describe() trees
+describe_instance = object()
+
+# -----------------------------------------------------------------------------
+
 
 class Exchange(object):
     """Base exchange class"""
@@ -112,6 +129,15 @@ class Exchange(object):
     aiohttp_trust_env = False
     requests_trust_env = False
     session = None  # Session () by default
+    # the keyword arguments of the requests HTTPAdapter, the threads that share an instance need up to pool_maxsize connections per host
+    requestsAdapter = {
+        'pool_connections': 10,
+        'pool_maxsize': 10,
+        'pool_block': False,
+    }
+    # the retries of the idempotent requests on connection errors and 502, 503, 504, off by default,
+    # True or the keyword arguments of urllib3.util.Retry
+    requestsRetry = None
     verify = True  # SSL verification
     validateServerSsl = True
     validateClientSsl = False
@@ -122,6 +148,9 @@ class Exchange(object):
         'chrome39': 'Mozilla/5.0 (Windows NT 6.1; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/39.0.2171.71 Safari/537.36',
         'chrome100': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36',
     }
+    staticRequestHeaders = None
+    staticRequestHeadersSession = None
+    staticRequestHeadersSnapshot = None
     verbose = False
     markets = None
     symbols = None
@@ -340,6 +369,14 @@ class Exchange(object):
     minFundingAddressLength = 1  # used in check_address
     substituteCommonCurrencyCodes = True
     quoteJsonNumbers = True
+    jsonCodec = 'json'  # the decoder of the responses: json, orjson, ujson or auto for the fastest one installed
+    # async only, the successful json responses are decoded from their bytes without materializing their text,
+    # handle_errors() then receives an empty body for them, so this is only for the exchanges that find the errors in the json
+    decodeJsonFromBytes = False
+    # a request with params['streamResponse'] = True returns an iterator (an async iterator in async_support) of the items of a json array response,
+    # decoded one by one while they are downloaded, for the parse_* methods that accept iterators
+    streamChunkSize = 65536
+    json_decoder = None
     number = float  # or str (a pointer to a class)
     handleContentTypeApplicationZip = False
     # whether fees should be summed by currency code
@@ -364,6 +401,32 @@ class Exchange(object):
     # no lower case l or upper case I, O
     base58_alphabet = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
 
+    # the budget of the rest rate limiter: None for a budget per instance, 'shared' for the instances with the same
+    # exchange id and api key in this process, 'file' for the local processes sharing rateLimitDirectory, or a TokenBucket
+    rateLimitBackend = None
+    rateLimitDirectory = None
+    # the cache of the GET endpoints that declare a ttl in milliseconds next to their cost in the api definitions:
+    # None to disable it, 'memory' for an LRU of responseCacheSize responses per instance, or a ResponseCache
+    responseCacheBackend = None
+    responseCacheSize = 1000
+    response_cache = None
+
+    # opt-in on-disk cache of the loaded markets, shared by the processes that use the same directory
+    marketsCacheDirectory = None
+    marketsCacheTTL = 3600000  # milliseconds, older markets are still used while being refreshed in the background
+    # the options that change the loaded markets, the others (like timeDifference) do not change the cache key
+    marketsCacheOptions = ['fetchMarkets', 'fetchCurrencies', 'defaultType', 'defaultSubType', 'defaultSettle', 'sandboxMode']
+    # instances of the same exchange class with the same sandbox mode and options can share one read-only market table
+    shareMarkets = False
+    shared_markets = {}
+    shared_markets_locks = {}
+    shared_markets_loading = {}
+    # safe_market() results for the unknown market ids split by a delimiter
+    split_markets = None
+    split_markets_by_id = None
+    split_markets_limit = 10000
+    markets_cache_keys = ['markets', 'markets_by_id', 'symbols', 'ids', 'currencies', 'currencies_by_id', 'codes', 'baseCurrencies', 'quoteCurrencies']
+
     commonCurrencies = {
         'XBT': 'BTC',
         'BCC': 'BCH',
@@ -400,33 +463,27 @@ class Exchange(object):
         self.origin = self.uuid()
         self.userAgent = default_user_agent()
 
-        settings = self.deep_extend(self.describe(), config)
+        # the describe() tree is built once per class, only the user config is merged per instance
+        description = self.describe_template()
+        keys = list(description) + [key for key in config if key not in description]
 
-        for key in settings:
+        for key in keys:
+            value = self.copy_description(description[key], describe_instance, self) if key in description else None
+            if key in config:
+                value = self.deep_extend(value, config[key])
             if hasattr(self, key) and isinstance(getattr(self, key), dict):
-                setattr(self, key, self.deep_extend(getattr(self, key), settings[key]))
+                setattr(self, key, self.deep_extend(getattr(self, key), value))
             else:
-                setattr(self, key, settings[key])
+                setattr(self, key, value)
 
         if self.api:
-            self.define_rest_api(self.api, 'request')
+            self.define_rest_api_once(self.api, 'request')
 
         if self.markets:
             self.set_markets(self.markets)
 
         # convert all properties from underscore notation foo_bar to camelcase notation fooBar
-        cls = type(self)
-        for name in dir(self):
-            if name[0] != '_' and name[-1] != '_' and '_' in name:
-                parts = name.split('_')
-                # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
-                exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
-                camelcase = parts[0] + ''.join(exceptions.get(i, self.capitalize(i)) for i in parts[1:])
-                attr = getattr(self, name)
-                if isinstance(attr, types.MethodType):
-                    setattr(cls, camelcase, getattr(cls, name))
-                else:
-                    setattr(self, camelcase, attr)
+        self.define_camelcase_aliases()
 
         self.tokenBucket = self.extend({
             'refillRate': 1.0 / self.rateLimit if self.rateLimit > 0 else float('inf'),
@@ -434,12 +491,44 @@ class Exchange(object):
             'capacity': 1.0,
             'defaultCost': 1.0,
         }, getattr(self, 'tokenBucket', {}))
+        self.init_rest_rate_limiter()
+
+        self.response_cache = self.create_response_cache()
+
+        try:
+            self.json_decoder = get_json_codec(self.jsonCodec)
+        except (ValueError, ImportError) as e:
+            raise NotSupported(self.id + ' ' + str(e))
 
         if not self.session and self.synchronous:
-            self.session = Session()
-            self.session.trust_env = self.requests_trust_env
+            self.session = self.create_session()
         self.logger = self.logger if self.logger else logging.getLogger(__name__)
 
+    def create_session(self):
+        session = Session()
+        session.trust_env = self.requests_trust_env
+        # the cookies are not stored, instead of clearing the jar that the threads share before every request
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(max_retries=self.create_retry_policy(), **self.requestsAdapter)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def create_retry_policy(self):
+        if not self.requestsRetry:
+            return 0
+        options = self.extend({
+            'total': 3,
+            'backoff_factor': 0.5,
+            'status_forcelist': [502, 503, 504],
+            'allowed_methods': ['GET', 'HEAD', 'OPTIONS'],
+            # the last response is handled as usual once the retries are exhausted
+            'raise_on_status': False,
+        }, self.requestsRetry if isinstance(self.requestsRetry, dict) else {})
+        if not hasattr(Retry, 'DEFAULT_ALLOWED_METHODS'):  # urllib3 < 1.26
+            options['method_whitelist'] = options.pop('allowed_methods')
+        return Retry(**options)
+
     def __del__(self):
         if self.session:
             try:
@@ -456,6 +545,28 @@ class Exchange(object):
     def describe(self):
         return {}
 
+    def describe_template(self):
+        # describe() deep-extends the trees of all parent classes on every call, so it is only
+        # called for the first instance of a class, the cached result must not be mutated
+        cls = type(self)
+        template = cls.__dict__.get('_describe_template')
+        if template is None:
+            template = self.copy_description(self.describe(), self, describe_instance)
+            cls._describe_template = template
+        return template
+
+    @staticmethod
+    def copy_description(value, bound_from, bound_to):
+        # copies dicts and lists recursively and rebinds the methods of bound_from to bound_to,
+        # like 'ping': self.ping in the ws options
+        if isinstance(value, dict):
+            return {key: Exchange.copy_description(value[key], bound_from, bound_to) for key in value}
+        if isinstance(value, list):
+            return [Exchange.copy_description(item, bound_from, bound_to) for item in value]
+        if isinstance(value, types.MethodType) and value.__self__ is bound_from:
+            return types.MethodType(value.__func__, bound_to)
+        return value
+
     def set_sandbox_mode(self, enabled):
         if enabled:
             if 'test' in self.urls:
@@ -510,6 +621,53 @@ class Exchange(object):
         setattr(cls, camelcase, to_bind)
         setattr(cls, underscore, to_bind)
 
+    def define_rest_api_once(self, api, method_name):
+        # the generated endpoints are set on the class, so they are only defined
+        # for the first instance and redefined if another instance has a different api
+        cls = type(self)
+        defined_api = cls.__dict__.get('_defined_rest_api')
+        if defined_api is api or (defined_api is not None and defined_api == api):
+            return
+        self.define_rest_api(api, method_name)
+        cls._defined_rest_api = api
+        # the new endpoints need their own camelcase aliases
+        cls._camelcase_attributes = None
+
+    @staticmethod
+    def underscore_to_camelcase(name):
+        parts = name.split('_')
+        # fetch_ohlcv → fetchOHLCV (not fetchOhlcv!)
+        exceptions = {'ohlcv': 'OHLCV', 'le': 'LE', 'be': 'BE'}
+        return parts[0] + ''.join(exceptions.get(i, Exchange.capitalize(i)) for i in parts[1:])
+
+    def define_camelcase_aliases(self):
+        cls = type(self)
+        if cls.__dict__.get('_camelcase_attributes') is None:
+            # methods are aliased on the class once, the names of the other
+            # class attributes are remembered and aliased on every instance
+            attributes = []
+            for name in dir(cls):
+                if name[0] != '_' and name[-1] != '_' and '_' in name:
+                    camelcase = self.underscore_to_camelcase(name)
+                    value = next(klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__)
+                    if isinstance(value, (types.FunctionType, staticmethod, classmethod)):
+                        setattr(cls, camelcase, value)
+                    else:
+                        attributes.append((name, camelcase))
+            cls._camelcase_attributes = attributes
+        instance_attributes = self.__dict__
+        for name, camelcase in cls._camelcase_attributes:
+            if name not in instance_attributes:
+                setattr(self, camelcase, getattr(self, name))
+        for name in list(instance_attributes):
+            if name[0] != '_' and name[-1] != '_' and '_' in name:
+                camelcase = self.underscore_to_camelcase(name)
+                attr = getattr(self, name)
+                if isinstance(attr, types.MethodType):
+                    setattr(cls, camelcase, getattr(cls, name))
+                else:
+                    setattr(self, camelcase, attr)
+
     def define_rest_api(self, api, method_name, paths=[]):
         for key, value in api.items():
             uppercase_method = key.upper()
@@ -532,14 +690,40 @@ class Exchange(object):
             else:
                 self.define_rest_api(value, method_name, paths + [key])
 
-    def throttle(self, cost=None):
-        now = float(self.milliseconds())
-        elapsed = now - self.lastRestRequestTimestamp
-        cost = 1 if cost is None else cost
-        sleep_time = self.rateLimit * cost
-        if elapsed < sleep_time:
-            delay = sleep_time - elapsed
-            time.sleep(delay / 1000.0)
+    def init_rest_rate_limiter(self):
+        self.throttle = Throttler(self.tokenBucket, self.create_rate_limit_bucket())
+
+    def rate_limit_key(self):
+        # the api key is hashed so that it never appears in the file names
+        account = hashlib.sha256(str(self.apiKey).encode('utf-8')).hexdigest()[:16] if self.apiKey else 'public'
+        return self.id + '-' + account
+
+    def create_rate_limit_bucket(self):
+        if self.rateLimitBackend is None:
+            return None  # the throttler has its own bucket
+        elif self.rateLimitBackend == 'shared':
+            return TokenBucket.shared(self.rate_limit_key(), self.tokenBucket)
+        elif self.rateLimitBackend == 'file':
+            directory = self.rateLimitDirectory or tempfile.gettempdir()
+            return FileTokenBucket(os.path.join(directory, 'ccxt-' + self.rate_limit_key() + '.bucket'), self.tokenBucket)
+        elif isinstance(self.rateLimitBackend, str):
+            raise NotSupported(self.id + ' rateLimitBackend ' + self.rateLimitBackend + ' is not supported, use shared, file or a TokenBucket instance')
+        return self.rateLimitBackend
+
+    def create_response_cache(self):
+        if self.responseCacheBackend is None:
+            return None
+        elif self.responseCacheBackend == 'memory':
+            return ResponseCache(self.responseCacheSize)
+        elif isinstance(self.responseCacheBackend, str):
+            raise NotSupported(self.id + ' responseCacheBackend ' + self.responseCacheBackend + ' is not supported, use memory or a ResponseCache instance')
+        return self.responseCacheBackend
+
+    def response_cache_key(self, path, api, method, params, config):
+        # None for the requests that are not cached, the api key is part of the key for the caches shared by several instances
+        if self.response_cache is None or method != 'GET' or not self.safe_value(config, 'ttl'):
+            return None
+        return (self.rate_limit_key(), path, str(api), self.json(params))
 
     @staticmethod
     def gzip_deflate(response, text):
@@ -553,17 +737,27 @@ class Exchange(object):
 
     def prepare_request_headers(self, headers=None):
         headers = headers or {}
-        if self.session:
-            headers.update(self.session.headers)
-        headers.update(self.headers)
-        if self.userAgent:
-            if type(self.userAgent) is str:
-                headers.update({'User-Agent': self.userAgent})
-            elif (type(self.userAgent) is dict) and ('User-Agent' in self.userAgent):
-                headers.update(self.userAgent)
-        if self.proxy:
-            headers.update({'Origin': self.origin})
-        headers.update({'Accept-Encoding': 'gzip, deflate'})
+        # the headers that are the same for every request are merged once, and again when the session is replaced
+        # or when headers, userAgent, proxy or origin change, the changes to session.headers in place are not detected
+        snapshot = (self.headers, self.userAgent, self.proxy, self.origin)
+        if (self.staticRequestHeaders is None) or (self.staticRequestHeadersSession is not self.session) or (self.staticRequestHeadersSnapshot != snapshot):
+            static = {}
+            if self.session:
+                static.update(self.session.headers)
+            static.update(self.headers)
+            if self.userAgent:
+                if type(self.userAgent) is str:
+                    static.update({'User-Agent': self.userAgent})
+                elif (type(self.userAgent) is dict) and ('User-Agent' in self.userAgent):
+                    static.update(self.userAgent)
+            if self.proxy:
+                static.update({'Origin': self.origin})
+            static.update({'Accept-Encoding': 'gzip, deflate'})
+            self.staticRequestHeaders = static
+            self.staticRequestHeadersSession = self.session
+            # copies, so that the changes in place are compared too
+            self.staticRequestHeadersSnapshot = tuple(copy.copy(value) for value in snapshot)
+        headers.update(self.staticRequestHeaders)
         return self.set_headers(headers)
 
     def log(self, *args):
@@ -574,12 +768,12 @@ class Exchange(object):
 
     def on_json_response(self, response_body):
         if self.quoteJsonNumbers:
-            return json.loads(response_body, parse_float=str, parse_int=str)
+            return self.json_decoder.loads_quoted(response_body)
         else:
-            return json.loads(response_body)
+            return self.json_decoder.loads(response_body)
 
-    def fetch(self, url, method='GET', headers=None, body=None):
-        """Perform a HTTP request and return decoded JSON data"""
+    def fetch(self, url, method='GET', headers=None, body=None, stream=False):
+        """Perform a HTTP request and return decoded JSON data, or an iterator of the items of a JSON array if stream is True"""
         request_headers = self.prepare_request_headers(headers)
         url = self.proxy + url
 
@@ -591,7 +785,8 @@ class Exchange(object):
         if body:
             body = body.encode()
 
-        self.session.cookies.clear()
+        if self.session.cookies:  # a session passed in the config stores them
+            self.session.cookies.clear()
 
         http_response = None
         http_status_code = None
@@ -605,14 +800,38 @@ class Exchange(object):
                 headers=request_headers,
                 timeout=int(self.timeout / 1000),
                 proxies=self.proxies,
-                verify=self.verify and self.validateServerSsl
+                verify=self.verify and self.validateServerSsl,
+                stream=stream
             )
             # does not try to detect encoding
             response.encoding = 'utf-8'
             headers = response.headers
             http_status_code = response.status_code
             http_status_text = response.reason
-            http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, response.text, request_headers, request_body)
+            if self.enableRateLimit:
+                self.handle_rate_limit_headers(http_status_code, http_status_text, url, method, headers)
+            http_content = None
+            if stream:
+                chunks = response.iter_content(self.streamChunkSize)
+                first_chunk = next(chunks, b'')
+                if self.is_json_array_stream(http_status_code, headers, first_chunk):
+                    if self.enableLastResponseHeaders:
+                        self.last_response_headers = headers
+                    if self.verbose:
+                        self.log("\nfetch Response:", self.id, method, url, http_status_code, "ResponseHeaders:", headers, "ResponseBody: (streamed)")
+                    try:
+                        # the error checks see the status and the headers before the first item, the body is not read yet
+                        self.handle_errors(http_status_code, http_status_text, url, method, headers, '', None, request_headers, request_body)
+                        self.handle_http_status_code(http_status_code, http_status_text, url, method, '')
+                    except Exception:
+                        response.close()
+                        raise
+                    return self.iterate_json_response(response, itertools.chain([first_chunk], chunks))
+                http_content = first_chunk + b''.join(chunks)
+                http_text = http_content.decode('utf-8', errors='replace')
+            else:
+                http_text = response.text
+            http_response = self.on_rest_response(http_status_code, http_status_text, url, method, headers, http_text, request_headers, request_body)
             json_response = self.parse_json(http_response)
             # FIXME remove last_x_responses from subclasses
             if self.enableLastHttpResponse:
@@ -672,15 +891,65 @@ class Exchange(object):
         elif self.is_text_response(headers):
             return http_response
         else:
-            return response.content
+            return response.content if http_content is None else http_content
+
+    def is_json_array_stream(self, code, headers, first_chunk):
+        # the text is still needed for the error statuses and the exchanges that override on_rest_response or on_json_response,
+        # the streamed responses are not logged by the verbose mode nor stored in last_http_response
+        if code >= 400:
+            return False
+        if type(self).on_rest_response is not Exchange.on_rest_response or type(self).on_json_response is not Exchange.on_json_response:
+            return False
+        return headers.get('Content-Type', '').startswith('application/json') and first_chunk.lstrip()[:1] == b'['
+
+    def iterate_json_response(self, response, chunks):
+        try:
+            for item in self.json_decoder.iterate_array(chunks, self.quoteJsonNumbers):
+                yield item
+        except ValueError as e:
+            raise BadResponse(self.id + ' malformed json array response: ' + str(e)) from e
+        finally:
+            response.close()
 
     def parse_json(self, http_response):
         try:
-            if Exchange.is_json_encoded_object(http_response):
+            if isinstance(http_response, bytes) or Exchange.is_json_encoded_object(http_response):
                 return self.on_json_response(http_response)
         except ValueError:  # superclass of JsonDecodeError (python2)
             pass
 
+    def get_response_header(self, headers, name):
+        if not headers:
+            return None
+        value = headers.get(name)
+        if value is None:  # the async responses have a plain dict of headers
+            name = name.lower()
+            for key in headers:
+                if key.lower() == name:
+                    return headers[key]
+        return value
+
+    def handle_rate_limit_headers(self, code, reason, url, method, headers):
+        # exchanges override this to resync the rest rate limiter with the usage headers of their responses
+        if (code == 418) or (code == 429):
+            retry_after = self.get_response_header(headers, 'Retry-After')
+            if retry_after is not None:
+                if retry_after.isdigit():
+                    delay = int(retry_after) * 1000
+                else:
+                    timestamp = self.parse_date(retry_after)
+                    delay = None if timestamp is None else timestamp - self.milliseconds()
+                if delay is not None and delay > 0:
+                    self.pause_rate_limiter(delay)
+
+    def pause_rate_limiter(self, delay):
+        """Makes the next rest request wait for delay milliseconds at least"""
+        self.throttle.bucket.pause(delay)
+
+    def resync_rate_limiter(self, remaining, window):
+        """Lets the rest rate limiter spend no more than the remaining cost in the next window milliseconds"""
+        self.throttle.bucket.resync(remaining, window)
+
     def is_text_response(self, headers):
         # https://github.com/ccxt/ccxt/issues/5302
         content_type = headers.get('Content-Type', '')
@@ -1454,11 +1723,199 @@ class Exchange(object):
                 if not self.markets_by_id:
                     return self.set_markets(self.markets)
                 return self.markets
-        currencies = None
-        if self.has['fetchCurrencies'] is True:
-            currencies = self.fetch_currencies()
-        markets = self.fetch_markets(params)
-        return self.set_markets(markets, currencies)
+            if self.shareMarkets:
+                return self.load_shared_markets(params)
+        return self.load_markets_tables(reload, params)
+
+    def load_markets_tables(self, reload=False, params={}):
+        cache_path = self.markets_cache_path()
+        if not reload and cache_path and self.restore_markets_cache(cache_path, params):
+            return self.markets
+        # a reload does not read the markets from the response cache
+        token = response_cache_bypass.set(reload)
+        try:
+            currencies = None
+            if self.has['fetchCurrencies'] is True:
+                currencies = self.fetch_currencies()
+            markets = self.fetch_markets(params)
+        finally:
+            response_cache_bypass.reset(token)
+        result = self.set_markets(markets, currencies)
+        if cache_path:
+            self.write_markets_cache(cache_path, markets, currencies)
+        if self.shareMarkets:
+            self.register_shared_markets(self.shared_markets_key())
+        return result
+
+    def load_shared_markets(self, params={}):
+        key = self.shared_markets_key()
+        # the threads loading the same markets wait for the first one instead of fetching them again
+        with Exchange.shared_markets_locks.setdefault(key, threading.Lock()):
+            if not self.restore_shared_markets(key):
+                self.load_markets_tables(False, params)
+        return self.markets
+
+    def shared_markets_key(self):
+        return (type(self), self.markets_cache_key())
+
+    def register_shared_markets(self, key):
+        """Registers the markets of this instance to be reused by the other instances with the same key, they must not be mutated"""
+        Exchange.shared_markets[key] = dict((name, getattr(self, name, None)) for name in self.markets_cache_keys)
+
+    def restore_shared_markets(self, key):
+        shared = Exchange.shared_markets.get(key)
+        if shared is None:
+            return False
+        for name in self.markets_cache_keys:
+            setattr(self, name, shared[name])
+        return True
+
+    def markets_cache_key(self):
+        """A key for the markets of this exchange id, sandbox mode and the options in marketsCacheOptions"""
+        sandbox = isinstance(self.urls, dict) and ('apiBackup' in self.urls)
+        options = dict((key, self.options[key]) for key in self.marketsCacheOptions if key in self.options)
+        try:
+            options = json.dumps(options, sort_keys=True, default=lambda value: type(value).__name__)
+        except TypeError:  # keys of mixed types cannot be sorted
+            options = json.dumps(options, default=lambda value: type(value).__name__)
+        digest = hashlib.sha256(options.encode('utf-8')).hexdigest()[:16]
+        return '-'.join([str(self.id), 'sandbox' if sandbox else 'live', digest])
+
+    def markets_cache_path(self):
+        """The cache file for the markets of this exchange, None if the cache is disabled"""
+        if not self.marketsCacheDirectory:
+            return None
+        return os.path.join(self.marketsCacheDirectory, self.markets_cache_key() + '.json.gz')
+
+    def read_markets_cache(self, path):
+        try:
+            with open(path, 'rb') as file:
+                cache = json.loads(gzip.decompress(file.read()).decode('utf-8'))
+        except (OSError, EOFError, ValueError):  # a missing, unreadable or corrupted cache is ignored
+            return None
+        # the caches written by older versions held the processed tables instead of the fetched markets
+        return cache if isinstance(cache, dict) and 'timestamp' in cache and isinstance(cache.get('markets'), list) else None
+
+    def write_markets_cache(self, path, markets, currencies=None):
+        # the fetched markets and currencies are stored, set_markets() builds the tables again when they are restored
+        cache = {
+            'timestamp': self.milliseconds(),
+            'markets': self.to_array(markets),
+            'currencies': currencies,
+        }
+        try:
+            data = gzip.compress(json.dumps(cache, separators=(',', ':')).encode('utf-8'))
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            # write to a temporary file first, so that other processes never read a partially written cache
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    file.write(data)
+                os.replace(temporary_path, path)
+            except BaseException:
+                os.remove(temporary_path)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning('%s failed to write the markets cache %s: %s', self.id, path, e)
+
+    def restore_markets_cache(self, path, params={}):
+        """Restores the markets from the cache without network calls, stale markets are refreshed in the background"""
+        cache = self.read_markets_cache(path)
+        if cache is None:
+            return False
+        self.set_markets(cache['markets'], cache.get('currencies'))
+        if self.milliseconds() - cache['timestamp'] > self.marketsCacheTTL:
+            self.refresh_markets_cache(params)
+        return True
+
+    def refresh_markets_cache(self, params={}):
+        # markets are reloaded by a shallow copy of the exchange in another thread, so that
+        # the other threads keep using the restored markets until the new ones are complete
+        exchange = copy.copy(self)
+
+        def refresh():
+            try:
+                exchange.load_markets(True, params)
+                for key in self.markets_cache_keys:
+                    setattr(self, key, getattr(exchange, key, None))
+            except Exception as e:
+                self.logger.warning('%s failed to refresh the stale markets cache: %s', self.id, e)
+            finally:
+                # the session is shared and must not be closed when the copy is garbage-collected
+                exchange.session = None
+
+        thread = threading.Thread(target=refresh, name=self.id + ' markets cache refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def safe_market_structure(self, marketId=None):
+        return {
+            'id': marketId,
+            'symbol': marketId,
+            'base': None,
+            'quote': None,
+            'baseId': None,
+            'quoteId': None,
+            'active': None,
+            'type': None,
+            'linear': None,
+            'inverse': None,
+            'spot': False,
+            'swap': False,
+            'future': False,
+            'option': False,
+            'margin': False,
+            'contract': False,
+            'contractSize': None,
+            'expiry': None,
+            'expiryDatetime': None,
+            'optionType': None,
+            'strike': None,
+            'settle': None,
+            'settleId': None,
+            'precision': {
+                'amount': None,
+                'price': None,
+            },
+            'limits': {
+                'amount': {
+                    'min': None,
+                    'max': None,
+                },
+                'price': {
+                    'min': None,
+                    'max': None,
+                },
+                'cost': {
+                    'min': None,
+                    'max': None,
+                },
+            },
+            'info': None,
+        }
+
+    def safe_split_market(self, marketId, delimiter):
+        """The market of an unknown id split by the delimiter, cached until the markets are reloaded, each caller gets a shallow copy"""
+        if (self.split_markets is None) or (self.split_markets_by_id is not self.markets_by_id):
+            self.split_markets = {}
+            self.split_markets_by_id = self.markets_by_id
+        key = (marketId, delimiter)
+        result = self.split_markets.get(key)
+        if result is not None:
+            return result.copy()
+        result = self.safe_market_structure(marketId)
+        parts = marketId.split(delimiter)
+        if len(parts) == 2:
+            result['baseId'] = parts[0]
+            result['quoteId'] = parts[1]
+            result['base'] = self.safe_currency_code(result['baseId'])
+            result['quote'] = self.safe_currency_code(result['quoteId'])
+            result['symbol'] = result['base'] + '/' + result['quote']
+        if len(self.split_markets) >= self.split_markets_limit:  # ids coming from the exchange are not bounded
+            self.split_markets = {}
+        self.split_markets[key] = result
+        return result.copy()
 
     def load_fees(self, reload=False):
         if not reload:
@@ -2797,9 +3254,8 @@ class Exchange(object):
     def parse_trades(self, trades, market: Optional[object] = None, since: Optional[int] = None, limit: Optional[int] = None, params={}):
         trades = self.to_array(trades)
         result = []
-        for i in range(0, len(trades)):
-            trade = self.extend(self.parse_trade(trades[i], market), params)
-            result.append(trade)
+        for trade in trades:  # a list or an iterator
+            result.append(self.extend(self.parse_trade(trade, market), params))
         result = self.sort_by_2(result, 'timestamp', 'id')
         symbol = market['symbol'] if (market is not None) else None
         tail = (since is None)
@@ -2830,8 +3286,8 @@ class Exchange(object):
     def parse_ledger(self, data, currency: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None, params={}):
         result = []
         arrayData = self.to_array(data)
-        for i in range(0, len(arrayData)):
-            itemOrItems = self.parse_ledger_entry(arrayData[i], currency)
+        for item in arrayData:  # a list or an iterator
+            itemOrItems = self.parse_ledger_entry(item, currency)
             if isinstance(itemOrItems, list):
                 for j in range(0, len(itemOrItems)):
                     result.append(self.extend(itemOrItems[j], params))
@@ -2876,12 +3332,23 @@ class Exchange(object):
         return self.index_by(results, key) if indexed else results
 
     def fetch2(self, path, api: Any = 'public', method='GET', params={}, headers: Optional[Any] = None, body: Optional[Any] = None, config={}, context={}):
+        stream = self.safe_value(params, 'streamResponse', False)
+        if stream:
+            params = self.omit(params, 'streamResponse')
+        cache_key = None if stream else self.response_cache_key(path, api, method, params, config)
+        if cache_key is not None:
+            response = self.response_cache.get(cache_key)
+            if response is not None:
+                return response
         if self.enableRateLimit:
             cost = self.calculate_rate_limiter_cost(api, method, path, params, config, context)
             self.throttle(cost)
         self.lastRestRequestTimestamp = self.milliseconds()
         request = self.sign(path, api, method, params, headers, body)
-        return self.fetch(request['url'], request['method'], request['headers'], request['body'])
+        response = self.fetch(request['url'], request['method'], request['headers'], request['body'], stream)
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response, config['ttl'])
+        return response
 
     def request(self, path, api: Any = 'public', method='GET', params={}, headers: Optional[Any] = None, body: Optional[Any] = None, config={}, context={}):
         return self.fetch2(path, api, method, params, headers, body, config, context)
@@ -2955,53 +3422,9 @@ class Exchange(object):
         }
 
     def safe_market(self, marketId=None, market=None, delimiter=None, marketType=None):
-        result = {
-            'id': marketId,
-            'symbol': marketId,
-            'base': None,
-            'quote': None,
-            'baseId': None,
-            'quoteId': None,
-            'active': None,
-            'type': None,
-            'linear': None,
-            'inverse': None,
-            'spot': False,
-            'swap': False,
-            'future': False,
-            'option': False,
-            'margin': False,
-            'contract': False,
-            'contractSize': None,
-            'expiry': None,
-            'expiryDatetime': None,
-            'optionType': None,
-            'strike': None,
-            'settle': None,
-            'settleId': None,
-            'precision': {
-                'amount': None,
-                'price': None,
-            },
-            'limits': {
-                'amount': {
-                    'min': None,
-                    'max': None,
-                },
-                'price': {
-                    'min': None,
-                    'max': None,
-                },
-                'cost': {
-                    'min': None,
-                    'max': None,
-                },
-            },
-            'info': None,
-        }
         if marketId is not None:
-            if (self.markets_by_id is not None) and (marketId in self.markets_by_id):
-                markets = self.markets_by_id[marketId]
+            markets = self.markets_by_id.get(marketId) if (self.markets_by_id is not None) else None
+            if markets is not None:
                 numMarkets = len(markets)
                 if numMarkets == 1:
                     return markets[0]
@@ -3014,20 +3437,10 @@ class Exchange(object):
                         if market[inferredMarketType]:
                             return market
             elif delimiter is not None:
-                parts = marketId.split(delimiter)
-                partsLength = len(parts)
-                if partsLength == 2:
-                    result['baseId'] = self.safe_string(parts, 0)
-                    result['quoteId'] = self.safe_string(parts, 1)
-                    result['base'] = self.safe_currency_code(result['baseId'])
-                    result['quote'] = self.safe_currency_code(result['quoteId'])
-                    result['symbol'] = result['base'] + '/' + result['quote']
-                    return result
-                else:
-                    return result
+                return self.safe_split_market(marketId, delimiter)
         if market is not None:
             return market
-        return result
+        return self.safe_market_structure(marketId)
 
     def check_required_credentials(self, error=True):
         keys = list(self.requiredCredentials.keys())
@@ -3547,10 +3960,9 @@ class Exchange(object):
         #     ]
         #
         results = []
-        if isinstance(tickers, list):
-            for i in range(0, len(tickers)):
-                ticker = self.extend(self.parse_ticker(tickers[i]), params)
-                results.append(ticker)
+        if not isinstance(tickers, dict):  # a list or an iterator
+            for ticker in tickers:
+                results.append(self.extend(self.parse_ticker(ticker), params))
         else:
             marketIds = list(tickers.keys())
             for i in range(0, len(marketIds)):
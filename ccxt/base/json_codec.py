@@ -0,0 +1,154 @@
+import codecs
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JsonCodec:
+    """Decodes json with the stdlib, loads_quoted() keeps the numbers as strings"""
+
+    def __init__(self):
+        # one decoder for all the responses, json.loads(data, parse_float=str, parse_int=str) builds a new one per call
+        self.quoted_decoder = json.JSONDecoder(parse_float=str, parse_int=str)
+        self.decoder = json.JSONDecoder()
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def loads_quoted(self, data):
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return self.quoted_decoder.decode(data)
+
+    def iterate_array(self, chunks, quoted=True):
+        # the items are decoded with the stdlib, the other libraries cannot decode a document incrementally
+        return iterate_json_array(chunks, self.quoted_decoder if quoted else self.decoder)
+
+    def array_decoder(self, quoted=True):
+        # for the chunks that are read asynchronously
+        return JsonArrayDecoder(self.quoted_decoder if quoted else self.decoder)
+
+
+class OrjsonCodec(JsonCodec):
+    # orjson cannot keep the numbers as strings, loads_quoted() is the stdlib one
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    # ujson cannot keep the numbers as strings, loads_quoted() is the stdlib one
+    def loads(self, data):
+        return ujson.loads(data)
+
+
+whitespace = re.compile(r'[ \t\n\r]*')
+
+
+class JsonArrayDecoder:
+    """Decodes the items of a json array from the bytes chunks fed to it, only the pending text of an item is kept"""
+
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.decode = codecs.getincrementaldecoder('utf-8')(errors='replace').decode
+        self.buffer = ''
+        self.position = 0
+        self.state = '['  # then 'first' before the first item or ']', ',' after an item, 'item' after a comma, ']' at the end
+        self.target = 0  # the pending text must double before an incomplete item is decoded again
+        self.done = False
+
+    def feed(self, chunk, final=False):
+        """Returns the items completed by the chunk, the final chunk raises a ValueError if the array is incomplete"""
+        if self.done:
+            return []
+        self.buffer += self.decode(chunk, final)
+        if not final and len(self.buffer) - self.position < self.target:
+            return []
+        items = []
+        buffer = self.buffer
+        position = self.position
+        state = self.state
+        while True:
+            position = whitespace.match(buffer, position).end()
+            if position >= len(buffer):
+                break
+            char = buffer[position]
+            if state == '[':
+                if char != '[':
+                    raise ValueError('the json document is not an array')
+                position += 1
+                state = 'first'
+                continue
+            elif char == ']' and (state == 'first' or state == ','):
+                position += 1
+                state = ']'
+                self.done = True
+                break
+            elif state == ',':
+                if char != ',':
+                    raise ValueError('expected , or ] after an item of the json array')
+                position += 1
+                state = 'item'
+                continue
+            end = None
+            try:
+                item, end = self.decoder.raw_decode(buffer, position)
+            except ValueError:  # incomplete
+                pass
+            # an item is complete when it is followed by , or ], a number cut by the end of a chunk is not
+            following = whitespace.match(buffer, end).end() if end is not None else None
+            if end is None or buffer[following:following + 1] not in (',', ']'):
+                break
+            items.append(item)
+            position = end
+            state = ','
+        self.buffer = buffer[position:]
+        self.position = 0
+        self.state = state
+        self.target = 2 * len(self.buffer)
+        if final and not self.done:
+            raise ValueError('the json array is incomplete')
+        return items
+
+
+def iterate_json_array(chunks, decoder):
+    """Yields the items of a json array from its bytes chunks, only the items of one chunk are decoded at a time"""
+    array = JsonArrayDecoder(decoder)
+    for chunk in chunks:
+        for item in array.feed(chunk):
+            yield item
+        if array.done:
+            return
+    for item in array.feed(b'', True):
+        yield item
+
+
+json_codec_classes = {
+    'json': (JsonCodec, json),
+    'orjson': (OrjsonCodec, orjson),
+    'ujson': (UjsonCodec, ujson),
+}
+
+json_codecs = {}
+
+
+def get_json_codec(name='json'):
+    """The codec named json, orjson or ujson, auto is the fastest one installed"""
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'ujson' if ujson is not None else 'json'
+    if name not in json_codecs:
+        if name not in json_codec_classes:
+            raise ValueError('json codec ' + str(name) + ' is not supported, use json, orjson, ujson or auto')
+        codec_class, module = json_codec_classes[name]
+        if module is None:
+            raise ImportError('json codec ' + name + ' requires the ' + name + ' package')
+        json_codecs[name] = codec_class()
+    return json_codecs[name]
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""Lazy exchange loading for the ccxt, ccxt.async_support and ccxt.pro packages"""
+
+# -----------------------------------------------------------------------------
+
+import importlib
+import sys
+import types
+
+# -----------------------------------------------------------------------------
+
+__all__ = [
+    'LazyExchangesModule',
+    'lazy_load_exchanges',
+]
+
+# -----------------------------------------------------------------------------
+
+
+class LazyExchangesModule(types.ModuleType):
+    """A package module that imports an exchange submodule on first access to its class"""
+
+    def __getattr__(self, name):
+        # only called when the regular attribute lookup fails
+        if name in self.__dict__.get('_lazy_exchanges', ()):
+            module = importlib.import_module(self.__name__ + '.' + name)
+            setattr(self, name, getattr(module, name))
+            return self.__dict__[name]
+        raise AttributeError("module '" + self.__name__ + "' has no attribute '" + name + "'")
+
+    def __setattr__(self, name, value):
+        # the import machinery binds every imported submodule on its parent package,
+        # so importing ccxt.binance (directly or from ccxt.binanceusdm) would shadow
+        # the ccxt.binance exchange class with the ccxt.binance module
+        if isinstance(value, types.ModuleType) and \
+                name in self.__dict__.get('_lazy_exchanges', ()) and \
+                value.__name__ == self.__name__ + '.' + name:
+            value = getattr(value, name)
+        super(LazyExchangesModule, self).__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(self.__dict__.get('_lazy_exchanges', ())))
+
+
+def lazy_load_exchanges(module_name, exchanges):
+    """Makes the exchange classes of a package importable on demand, ccxt.binance imports ccxt/binance.py only"""
+    module = sys.modules[module_name]
+    module._lazy_exchanges = frozenset(exchanges)
+    # replace exchange submodules that have already been bound to the package by the import machinery
+    for name in exchanges:
+        value = module.__dict__.get(name)
+        if isinstance(value, types.ModuleType):
+            setattr(module, name, getattr(value, name))
+    module.__class__ = LazyExchangesModule
+    return module
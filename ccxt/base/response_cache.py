@@ -0,0 +1,55 @@
+import collections
+import contextvars
+import pickle
+import threading
+from time import time
+
+# set while the markets are reloaded, the responses are fetched again and replace the cached ones
+bypass = contextvars.ContextVar('bypass', default=False)
+
+
+class ResponseCache:
+    """An in-memory LRU cache of the responses, the entries expire after their ttl in milliseconds,
+    the responses are stored pickled, so every caller gets its own copy of a response without copying it twice"""
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self.entries = collections.OrderedDict()  # key: (expiry, pickled response)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = None if bypass.get() else self.entries.get(key)
+            if entry is None or entry[0] <= time() * 1000:
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        # unpickled outside of the lock, much faster than a deepcopy of the response
+        return pickle.loads(entry[1])
+
+    def set(self, key, response, ttl):
+        pickled = pickle.dumps(response, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            self.entries[key] = (time() * 1000 + ttl, pickled)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
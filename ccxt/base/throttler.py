@@ -0,0 +1,133 @@
+import os
+import struct
+import threading
+from time import sleep, time
+from ccxt.base.errors import NotSupported
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # windows
+
+
+class TokenBucket:
+    """The tokens of one or more throttlers, the requests reserve their cost and wait for the returned delay"""
+
+    defaults = {
+        'refillRate': 1.0,
+        'tokens': 0,
+        'capacity': 1.0,
+    }
+    # whether reserve() does blocking i/o, the async throttler calls it in an executor then
+    blocking = False
+    # the buckets shared by the exchange instances in this process, by key
+    shared_buckets = {}
+    shared_buckets_lock = threading.Lock()
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.last_timestamp = time() * 1000
+
+    @classmethod
+    def shared(cls, key, config):
+        with cls.shared_buckets_lock:
+            if key not in cls.shared_buckets:
+                cls.shared_buckets[key] = cls(dict(cls.defaults, **config))
+            return cls.shared_buckets[key]
+
+    @staticmethod
+    def refill(config, tokens, elapsed):
+        # the initial tokens above the capacity are kept until they are spent
+        if elapsed > 0 and tokens < config['capacity']:
+            return min(tokens + elapsed * config['refillRate'], config['capacity'])
+        return tokens
+
+    @staticmethod
+    def debit(config, tokens, cost):
+        # a request is let through once the tokens are not negative, the next ones wait for the debt to be refilled
+        delay = 0 if tokens >= 0 else -tokens / config['refillRate']
+        return tokens - cost, delay
+
+    def modify(self, function):
+        """Replaces the current tokens with the tokens returned by the function, along with its result"""
+        with self.lock:
+            now = time() * 1000
+            tokens = self.refill(self.config, self.config['tokens'], now - self.last_timestamp)
+            self.last_timestamp = max(now, self.last_timestamp)
+            self.config['tokens'], result = function(tokens)
+        return result
+
+    def available(self):
+        """The current tokens, refilled up to now"""
+        return self.modify(lambda tokens: (tokens, tokens))
+
+    def reserve(self, cost):
+        return self.modify(lambda tokens: self.debit(self.config, tokens, cost))
+
+    def pause(self, delay):
+        """Makes the next request wait for delay milliseconds at least"""
+        self.modify(lambda tokens: (min(tokens, -delay * self.config['refillRate']), None))
+
+    def resync(self, remaining, window):
+        """Lowers the tokens so that no more than the remaining cost is spent in the next window milliseconds,
+        it never adds tokens, a response that was sent before the latest ones can report an older usage"""
+        self.modify(lambda tokens: (min(tokens, remaining - window * self.config['refillRate']), None))
+
+
+class FileTokenBucket(TokenBucket):
+    """A token bucket stored in a file, shared by the local processes that use the same path"""
+
+    blocking = True
+
+    def __init__(self, path, config):
+        if fcntl is None:
+            raise NotSupported('FileTokenBucket requires fcntl, the file rateLimitBackend is not supported on this platform')
+        super(FileTokenBucket, self).__init__(dict(self.defaults, **config))
+        self.path = path
+        self.fd = None
+        self.pid = None
+
+    def modify(self, function):
+        with self.lock:
+            # a forked process must not share the open file (and its lock) with the parent
+            if self.pid != os.getpid():
+                self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                self.pid = os.getpid()
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                now = time() * 1000
+                data = os.pread(self.fd, 16, 0)
+                tokens, timestamp = struct.unpack('dd', data) if len(data) == 16 else (self.config['tokens'], now)
+                tokens = self.refill(self.config, tokens, now - timestamp)
+                tokens, result = function(tokens)
+                os.pwrite(self.fd, struct.pack('dd', tokens, max(now, timestamp)), 0)
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+        return result
+
+    def __del__(self):
+        if self.fd is not None and self.pid == os.getpid():
+            os.close(self.fd)
+
+
+class Throttler:
+    """Thread-safe token bucket for the synchronous exchanges, with the same config as the async Throttler"""
+
+    def __init__(self, config, bucket=None):
+        self.config = {
+            'refillRate': 1.0,
+            'delay': 0.001,
+            'cost': 1.0,
+            'tokens': 0,
+            'capacity': 1.0,
+        }
+        self.config.update(config)
+        self.bucket = TokenBucket(self.config) if bucket is None else bucket
+
+    def __call__(self, cost=None):
+        cost = self.config['cost'] if cost is None else cost
+        # the threads reserve their cost upfront so that they wait for their turn concurrently
+        delay = self.bucket.reserve(cost)
+        if delay > 0:
+            sleep(delay / 1000.0)
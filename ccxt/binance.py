@@ -211,7 +211,7 @@ class binance(Exchange):
                     # UID(sapi) request rate limit of 180 000 per minute
                     # 1 UID(sapi) => cost = 1200 / 180 000 = 0.006667
                     'get': {
-                        'system/status': 0.1,
+                        'system/status': {'cost': 0.1, 'ttl': 10000},
                         # these endpoints require self.apiKey
                         'accountSnapshot': 240,  # Weight(IP): 2400 => cost = 0.1 * 2400 = 240
                         'margin/asset': 1,  # Weight(IP): 10 => cost = 0.1 * 10 = 1
@@ -561,7 +561,7 @@ class binance(Exchange):
                     'get': {
                         'ping': 1,
                         'time': 1,
-                        'exchangeInfo': 1,
+                        'exchangeInfo': {'cost': 1, 'ttl': 60000},
                         'depth': {'cost': 2, 'byLimit': [[50, 2], [100, 5], [500, 10], [1000, 20]]},
                         'trades': 5,
                         'historicalTrades': 20,
@@ -639,7 +639,7 @@ class binance(Exchange):
                     'get': {
                         'ping': 1,
                         'time': 1,
-                        'exchangeInfo': 1,
+                        'exchangeInfo': {'cost': 1, 'ttl': 60000},
                         'depth': {'cost': 2, 'byLimit': [[50, 2], [100, 5], [500, 10], [1000, 20]]},
                         'trades': 5,
                         'historicalTrades': 20,
@@ -734,7 +734,7 @@ class binance(Exchange):
                     'get': {
                         'ping': 1,
                         'time': 1,
-                        'exchangeInfo': 1,
+                        'exchangeInfo': {'cost': 1, 'ttl': 60000},
                         'index': 1,
                         'ticker': 5,
                         'mark': 5,
@@ -792,7 +792,7 @@ class binance(Exchange):
                         'ticker/24hr': {'cost': 1, 'noSymbol': 40},
                         'ticker/price': {'cost': 1, 'noSymbol': 2},
                         'ticker/bookTicker': {'cost': 1, 'noSymbol': 2},
-                        'exchangeInfo': 10,
+                        'exchangeInfo': {'cost': 10, 'ttl': 60000},
                     },
                     'put': {
                         'userDataStream': 1,
@@ -918,6 +918,13 @@ class binance(Exchange):
             # exchange-specific options
             'options': {
                 'sandboxMode': False,
+                # the used weight per minute headers of the apis, with their weight limits and the cost of one weight
+                'usedWeightHeaders': {
+                    'sapi': {'header': 'X-SAPI-USED-IP-WEIGHT-1M', 'limit': 12000, 'cost': 0.1},
+                    'api': {'header': 'X-MBX-USED-WEIGHT-1M', 'limit': 1200, 'cost': 1},
+                    'fapi': {'header': 'X-MBX-USED-WEIGHT-1M', 'limit': 2400, 'cost': 1},
+                    'dapi': {'header': 'X-MBX-USED-WEIGHT-1M', 'limit': 2400, 'cost': 1},
+                },
                 'fetchMarkets': [
                     'spot',  # allows CORS in browsers
                     'linear',  # allows CORS in browsers
@@ -6849,6 +6856,23 @@ class binance(Exchange):
                 url += '?' + self.urlencode(params)
         return {'url': url, 'method': method, 'body': body, 'headers': headers}
 
+    def handle_rate_limit_headers(self, code, reason, url, method, headers):
+        super(binance, self).handle_rate_limit_headers(code, reason, url, method, headers)
+        # the used weight headers count the weight of the current minute, the rest of the minute
+        # can only spend the remaining weight, converted to the cost of the rate limiter
+        usedWeightHeaders = self.safe_value(self.options, 'usedWeightHeaders', {})
+        apis = list(usedWeightHeaders.keys())
+        for i in range(0, len(apis)):
+            api = apis[i]
+            if url.find('/' + api + '/') >= 0:
+                usedWeightHeader = usedWeightHeaders[api]
+                usedWeight = self.parse_number(self.get_response_header(headers, usedWeightHeader['header']))
+                if usedWeight is not None:
+                    remaining = (usedWeightHeader['limit'] - usedWeight) * usedWeightHeader['cost']
+                    window = 60000 - (self.milliseconds() % 60000)
+                    self.resync_rate_limiter(remaining, window)
+                return
+
     def handle_errors(self, code, reason, url, method, headers, body, response, requestHeaders, requestBody):
         if (code == 418) or (code == 429):
             raise DDoSProtection(self.id + ' ' + str(code) + ' ' + reason + ' ' + body)
@@ -0,0 +1,98 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import gzip  # noqa: E402
+import json  # noqa: E402
+import zlib  # noqa: E402
+from aiohttp import WSMessage, WSMsgType  # noqa: E402
+from ccxt.base.errors import NetworkError  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+from ccxt.async_support.base.ws.functions import gunzip, inflate  # noqa: E402
+
+# the payloads of several members or padded with zeroes are decompressed like a GzipFile does
+assert gunzip(gzip.compress(b'{"a":1}')) == '{"a":1}'
+assert gunzip(gzip.compress(b'[1,') + gzip.compress(b'2]')) == '[1,2]'
+assert gunzip(gzip.compress(b'[1]') + b'\x00\x00') == '[1]'
+for truncated in (gzip.compress(b'[1, 2, 3]')[:-4], b'not gzip'):
+    try:
+        gunzip(truncated)
+        assert False
+    except (EOFError, OSError, zlib.error):
+        pass
+deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+assert inflate(deflate.compress(b'{"b":2}') + deflate.flush()) == '{"b":2}'
+
+
+def create_client(config={}):
+    client = AiohttpClient('wss://example.com', None, None, None, None, config)
+    client.received = []
+    client.errors = []
+    client.on_message_callback = lambda client, message: client.received.append(message)
+    client.on_error_callback = lambda client, error: client.errors.append(error)
+    return client
+
+
+def binary(message):
+    return WSMessage(WSMsgType.BINARY, gzip.compress(json.dumps(message).encode()), None)
+
+
+def text(message):
+    return WSMessage(WSMsgType.TEXT, json.dumps(message), None)
+
+
+async def wait_decoded(client):
+    while client.decoding:
+        await asyncio.sleep(0.001)
+
+
+async def ordering():
+    # the messages decoded by the pool are handled in the order of arrival, whatever their size
+    client = create_client({'gunzip': True, 'decompressionWorkers': 2})
+    large = {'bids': [[str(i), str(i)] for i in range(20000)]}
+    client.handle_message(binary(large))
+    client.handle_message(binary({'id': 1}))
+    # a text message waits for the binary messages before it
+    client.handle_message(text({'id': 2}))
+    client.handle_message(binary({'id': 3}))
+    await wait_decoded(client)
+    assert client.received == [large, {'id': 1}, {'id': 2}, {'id': 3}]
+    # without pending messages a text message is handled right away
+    client.handle_message(text({'id': 4}))
+    assert client.received[-1] == {'id': 4}
+
+    # on the loop without workers
+    client = create_client({'gunzip': True})
+    client.handle_message(binary({'id': 1}))
+    assert client.received == [{'id': 1}] and client.decoding is None
+
+
+async def errors():
+    # a message that fails to decode resets the connection, the messages after it are dropped
+    client = create_client({'gunzip': True, 'decompressionWorkers': 2})
+    pending = client.future('ticker')
+    client.handle_message(binary({'id': 1}))
+    client.handle_message(WSMessage(WSMsgType.BINARY, b'not gzip', None))
+    client.handle_message(binary({'id': 3}))
+    client.handle_message(text({'id': 4}))
+    await wait_decoded(client)
+    await asyncio.sleep(0.01)
+    assert client.received == [{'id': 1}]
+    assert len(client.errors) == 1 and isinstance(client.errors[0], NetworkError)
+    assert isinstance(pending.exception(), NetworkError)
+    assert not client.decoding
+
+    # the messages that arrive after the reset are handled
+    client.handle_message(binary({'id': 5}))
+    await wait_decoded(client)
+    assert client.received == [{'id': 1}, {'id': 5}]
+
+
+asyncio.run(ordering())
+asyncio.run(errors())
+print('aiohttp client tests passed')
@@ -0,0 +1,200 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import gc  # noqa: E402
+from collections import deque  # noqa: E402
+from ccxt.base.errors import NetworkError, NotSupported  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+from ccxt.async_support.base.ws.client import Client  # noqa: E402
+from ccxt.async_support.base.ws.stream import Stream, subscribing  # noqa: E402
+from ccxt.async_support.base.ws.cache import ArrayCache  # noqa: E402
+
+
+def create_client(config={}):
+    return Client('wss://example.com', None, None, None, None, config)
+
+
+async def conflation():
+    # without conflation the results that nobody waits for are dropped
+    client = create_client()
+    client.resolve({'price': 1}, 'ticker')
+    assert not client.future('ticker').done()
+
+    # the latest result is returned by the next watch
+    client = create_client({'conflation': 'latest'})
+    client.resolve({'price': 1}, 'ticker')
+    client.resolve({'price': 2}, 'ticker')
+    assert await client.future('ticker') == {'price': 2}
+    assert client.conflation_stats('ticker') == {'skipped': 1, 'queued': 0, 'staleness': client.conflated['ticker']['staleness']}
+    assert not client.future('ticker').done()
+
+    # a queue of results, the oldest ones are skipped
+    client = create_client({'conflation': 2, 'conflations': {'trades': 'latest'}})
+    for price in range(1, 4):
+        client.resolve({'price': price}, 'ticker')
+    assert [await client.future('ticker'), await client.future('ticker')] == [{'price': 2}, {'price': 3}]
+    assert client.conflation_stats('ticker')['skipped'] == 1
+
+    # a cache updated in place is queued once, with its latest state
+    trades = ArrayCache(10)
+    for i in range(3):
+        trades.append({'id': i, 'symbol': 'BTC/USDT'})
+        client.resolve(trades, 'myTrades')
+    assert client.conflation_stats('myTrades') == {'skipped': 2, 'queued': 1, 'staleness': 0}
+    assert len(await client.future('myTrades')) == 3
+    pending = client.future('myTrades')
+    assert not pending.done()
+
+    # the results queued before a reconnection are not delivered after it
+    client.resolve({'price': 4}, 'ticker')
+    client.reset(NetworkError('connection closed'))
+    assert isinstance(pending.exception(), NetworkError)
+    assert client.conflated == {}
+    assert not client.future('ticker').done()
+
+
+asyncio.run(conflation())
+
+
+class DispatchClient(Client):
+    handled = 0
+
+    def handle_message(self, message):
+        self.handled += 1
+        self.resolve(message['data'], message['hash'])
+
+
+async def dispatch():
+    # without a budget the queued messages are all handled
+    client = DispatchClient('wss://example.com', None, None, None, None)
+    messages = deque({'hash': 'ticker', 'data': {'price': price}} for price in range(5))
+    ticker = client.future('ticker')
+    client.handle_messages(messages, client.dispatchBudget)
+    assert client.handled == 5 and not messages
+    assert await ticker == {'price': 0}
+
+    # a budget handles that many messages, the rest stays queued
+    messages = deque({'hash': 'ticker', 'data': {'price': price}} for price in range(5))
+    client.handle_messages(messages, 2)
+    assert client.handled == 7 and len(messages) == 3
+
+    # the resolves are coalesced, a waiting future gets the latest result of the batch
+    client = DispatchClient('wss://example.com', None, None, None, None, {'coalesceResolves': True})
+    messages = deque({'hash': hash, 'data': {'price': price}} for price in range(3) for hash in ('ticker', 'trades'))
+    ticker = client.future('ticker')
+    trades = client.future('trades')
+    client.handle_messages(messages, None)
+    assert await ticker == {'price': 2} and await trades == {'price': 2}
+    assert client.pending_resolves is None
+
+    # the results are resolved even if a message fails
+    class FailingClient(DispatchClient):
+        def handle_message(self, message):
+            if message is None:
+                raise ValueError('invalid message')
+            super(FailingClient, self).handle_message(message)
+
+    client = FailingClient('wss://example.com', None, None, None, None, {'coalesceResolves': True})
+    ticker = client.future('ticker')
+    try:
+        client.handle_messages(deque([{'hash': 'ticker', 'data': 1}, None]), None)
+        assert False
+    except ValueError:
+        pass
+    assert await ticker == 1
+
+
+asyncio.run(dispatch())
+
+
+def create_stream(client, message_hash, size=1):
+    subscriptions = []
+
+    async def watch():
+        # what Exchange.watch() does for the stream that is subscribing
+        subscriptions.append(message_hash)
+        subscribing.get().watched(client, message_hash)
+        return await client.future(message_hash)
+
+    stream = Stream(watch, None, size)
+    stream.subscriptions = subscriptions
+    return stream
+
+
+async def streams():
+    client = create_client()
+
+    # the first result comes from the watch method, the next ones are pushed by the client
+    async with create_stream(client, 'ticker', 2) as stream:
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        client.resolve({'price': 1}, 'ticker')
+        assert await first == {'price': 1}
+        assert stream in client.streams['ticker']
+        for price in range(2, 5):
+            client.resolve({'price': price}, 'ticker')
+        # the oldest result is skipped beyond size
+        assert [await stream.__anext__(), await stream.__anext__()] == [{'price': 3}, {'price': 4}]
+        assert stream.skipped == 1
+        waiting = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        client.resolve({'price': 5}, 'ticker')
+        assert await waiting == {'price': 5}
+        assert stream.subscriptions == ['ticker']
+    # async with closes the stream
+    assert 'ticker' not in client.streams
+    assert stream.client is None
+
+    # an error is raised by the next iteration, the one after subscribes again
+    stream = create_stream(client, 'trades')
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.resolve([1], 'trades')
+    await first
+    waiting = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.reject(NetworkError('connection closed'), 'trades')
+    try:
+        await waiting
+        assert False
+    except NetworkError:
+        pass
+    assert 'trades' not in client.streams
+    again = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.resolve([2], 'trades')
+    assert await again == [2]
+    assert stream.subscriptions == ['trades', 'trades']
+    stream.close()
+    assert 'trades' not in client.streams
+
+    # a stream dropped without close() is unregistered when it is collected
+    stream = create_stream(client, 'orderbook')
+    first = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    client.resolve({}, 'orderbook')
+    await first
+    assert len(client.streams['orderbook']) == 1
+    del stream, first
+    gc.collect()
+    assert len(client.streams['orderbook']) == 0
+    client.resolve({}, 'orderbook')
+
+
+asyncio.run(streams())
+
+# the streams only queue the resolved values of the methods that return them unprocessed
+exchange = Exchange({'id': 'streams_test'})
+assert exchange.stream_ticker('BTC/USDT').subscribe is not None
+try:
+    exchange.create_stream('watch_trades', 'BTC/USDT')
+    assert False
+except NotSupported:
+    pass
+print('client tests passed')
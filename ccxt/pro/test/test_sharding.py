@@ -0,0 +1,103 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+from ccxt.base.errors import NetworkError  # noqa: E402
+from ccxt.async_support.base.exchange import Exchange  # noqa: E402
+
+url = 'wss://example.com/ws'
+
+
+def create_exchange():
+    exchange = Exchange({'id': 'sharding_test', 'enableRateLimit': False, 'streaming': {'maxSubscriptionsPerConnection': 2}})
+    exchange.sent = []
+    return exchange
+
+
+def connected_client(exchange, shard=None):
+    # a client that does not connect, the messages it sends are recorded
+    client = exchange.client(url, shard)
+    if not client.connected.done():
+        client.connected.resolve(True)
+
+        async def send(message):
+            exchange.sent.append((client.shard, message))
+
+        client.send = send
+    return client
+
+
+async def subscriptions():
+    exchange = create_exchange()
+    first = connected_client(exchange, 0)
+    second = connected_client(exchange, 1)
+    # the first connection is the one of client(url), it is stored under its url
+    assert exchange.clients[url] is first and exchange.clients[(url, 1)] is second
+    futures = [exchange.watch(url, hash, {'subscribe': hash}, hash) for hash in ('a', 'b', 'c')]
+    await asyncio.sleep(0.01)
+    # the third subscription goes to the second connection, it is resolved by the messages of that connection
+    assert exchange.shardAssignments[url] == {'a': 0, 'b': 0, 'c': 1}
+    assert exchange.sent == [(0, {'subscribe': 'a'}), (0, {'subscribe': 'b'}), (1, {'subscribe': 'c'})]
+    second.resolve('update', 'c')
+    assert await futures[2] == 'update'
+    # watching it again finds its connection through the assignment
+    future = exchange.watch(url, 'c', {'subscribe': 'c'}, 'c')
+    assert future is second.futures['c']
+    assert exchange.shard(url, 'c', False) == 1
+    # a future that waits without a subscription is found on its connection, the unknown ones go to the first connection
+    response = second.future('response')
+    assert exchange.shard(url, 'response', False) == 1
+    assert exchange.shard(url, 'unknown', False) == 0
+    assert exchange.connection_load()[1]['subscriptions'] == 1
+
+    # an error on the second connection removes it and its assignments, the subscription goes elsewhere when it is watched again
+    second.error = NetworkError('connection closed')
+    second.reject(second.error)
+    assert future.exception() is second.error and response.exception() is second.error
+    exchange.on_error(second, second.error)
+    assert (url, 1) not in exchange.clients
+    assert exchange.shardAssignments[url] == {'a': 0, 'b': 0}
+    assert exchange.shard(url, 'c') == 1
+    assert exchange.shard(url, 'd') == 1
+
+    # the subscriptions of the connection that the exchange code prepared stay on it
+    client = exchange.client(url)
+    assert client is first
+    client.subscriptions['authenticated'] = True
+    assert exchange.shard(url, 'authenticated', False) == 0
+    assert exchange.shard(url, 'balance') == 0
+    assert exchange.shard(url, 'orders') == 2
+    for client in list(exchange.clients.values()):
+        await client.close()
+    await exchange.close()
+
+
+async def other_task():
+    exchange = create_exchange()
+    for hash in ('a', 'b'):
+        exchange.shard(url, hash)
+
+    async def prepare():
+        exchange.client(url)
+
+    # client(url) only concerns the subscriptions of its own task
+    await asyncio.ensure_future(prepare())
+    assert exchange.shard(url, 'c') == 1
+    exchange.client(url)
+    assert exchange.shard(url, 'd') == 0
+    assert exchange.shard(url, 'e') == 1
+    await exchange.close()
+
+
+async def main():
+    await subscriptions()
+    await other_task()
+
+
+asyncio.run(main())
+print('sharding tests passed')
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import tracemalloc
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+exchanges = sys.argv[1:] or ['bybit', 'binance', 'huobi', 'okx']
+runs = 100
+
+# ------------------------------------------------------------------------------
+
+print('exchange'.ljust(12), 'first (ms)'.rjust(12), 'next (ms)'.rjust(12), 'memory (KiB)'.rjust(14))
+
+for id in exchanges:
+    exchange_class = getattr(ccxt, id)
+    start = time.perf_counter()
+    exchange_class()
+    first = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for i in range(0, runs):
+        exchange_class({'apiKey': str(i)})
+    next = (time.perf_counter() - start) * 1000 / runs
+    tracemalloc.start()
+    instances = [exchange_class({'apiKey': str(i)}) for i in range(0, 10)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    memory = current / len(instances) / 1024
+    print(id.ljust(12), ('%.2f' % first).rjust(12), ('%.2f' % next).rjust(12), ('%.1f' % memory).rjust(14))
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import tracemalloc
+
+# ------------------------------------------------------------------------------
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ------------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# ------------------------------------------------------------------------------
+
+runs = 100000
+
+exchange = ccxt.Exchange({'id': 'benchmark'})
+exchange.set_markets([
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'baseId': 'BTC', 'quoteId': 'USDT', 'type': 'spot', 'spot': True},
+    {'id': 'ETHUSDT', 'symbol': 'ETH/USDT', 'base': 'ETH', 'quote': 'USDT', 'baseId': 'ETH', 'quoteId': 'USDT', 'type': 'spot', 'spot': True},
+])
+
+cases = [
+    ('safe_market hit', lambda: exchange.safe_market('BTCUSDT')),
+    ('safe_market split', lambda: exchange.safe_market('XBT_EUR', None, '_')),
+    ('safe_market miss', lambda: exchange.safe_market('UNKNOWN')),
+    ('safe_symbol hit', lambda: exchange.safe_symbol('ETHUSDT')),
+    ('safe_symbol split', lambda: exchange.safe_symbol('XBT-EUR', None, '-')),
+]
+
+# ------------------------------------------------------------------------------
+
+print('case'.ljust(20), 'calls/s'.rjust(12), 'allocated (B/call)'.rjust(20))
+
+for name, call in cases:
+    start = time.perf_counter()
+    for i in range(0, runs):
+        call()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    results = [call() for i in range(0, 1000)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = (current - sys.getsizeof(results)) / len(results)
+    print(name.ljust(20), ('%.0f' % (runs / elapsed)).rjust(12), ('%.0f' % allocated).rjust(20))
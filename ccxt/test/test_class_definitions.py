@@ -0,0 +1,59 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+
+class Exchange(ccxt.Exchange):
+    definitions = 0
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'class_definitions_test',
+            'api': {
+                'public': {
+                    'get': {
+                        'ticker': 1,
+                    },
+                },
+            },
+        })
+
+    def define_rest_api(self, api, method_name, paths=[]):
+        if not paths:
+            type(self).definitions += 1
+        return super(Exchange, self).define_rest_api(api, method_name, paths)
+
+    def fetch_ticker(self, symbol, params={}):
+        return self.publicGetTicker(params)
+
+
+# the endpoints and the camelcase aliases of the methods are defined on the class by the first instance
+first = Exchange()
+second = Exchange()
+assert Exchange.definitions == 1
+assert 'publicGetTicker' in Exchange.__dict__ and 'public_get_ticker' in Exchange.__dict__
+assert Exchange.__dict__['fetchTicker'] is Exchange.__dict__['fetch_ticker']
+assert first.fetchOHLCV.__func__ is ccxt.Exchange.fetch_ohlcv
+# the aliases of a subclass do not replace the ones of the base class
+assert ccxt.Exchange().fetchTicker.__func__ is ccxt.Exchange.fetch_ticker
+assert Exchange().fetchTicker.__func__ is Exchange.fetch_ticker
+
+# the data attributes are aliased on every instance, with their own values
+third = Exchange({'last_json_response': {'a': 1}})
+assert third.lastJsonResponse == {'a': 1}
+assert second.lastJsonResponse is None
+assert 'lastJsonResponse' in vars(third)
+
+# an instance with another api redefines the endpoints and their aliases
+other = Exchange({'api': {'public': {'get': {'ticker': 1, 'trades': 1}}}})
+assert Exchange.definitions == 2
+assert callable(other.publicGetTrades) and callable(other.public_get_trades)
+Exchange({'api': {'public': {'get': {'ticker': 1, 'trades': 1}}}})
+assert Exchange.definitions == 2
+print('class definitions tests passed')
@@ -0,0 +1,92 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+
+class Exchange(ccxt.async_support.Exchange):
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'coalesced_requests_test',
+            'rateLimit': 10,
+            'api': {
+                'public': {
+                    'get': {
+                        'ticker': 1,
+                    },
+                },
+                'private': {
+                    'get': {
+                        'balance': 1,
+                    },
+                },
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': 'https://example.com/' + path + '?' + self.urlencode(params), 'method': method, 'body': body, 'headers': headers}
+
+    async def fetch(self, url, method='GET', headers=None, body=None, stream=False):
+        self.fetched.append(url[len('https://example.com/'):])
+        await asyncio.sleep(0.01)
+        return {'url': url, 'data': [1, 2, 3]}
+
+
+def create_exchange():
+    exchange = Exchange({'coalesceRequests': True})
+    exchange.fetched = []
+    return exchange
+
+
+async def concurrent_callers():
+    exchange = create_exchange()
+    # the identical public requests in flight make one round trip
+    responses = await asyncio.gather(*[exchange.publicGetTicker({'symbol': 'BTC/USDT'}) for i in range(5)])
+    assert exchange.fetched == ['ticker?symbol=BTC%2FUSDT']
+    assert all(response == responses[0] for response in responses)
+    # every caller gets its own copy of the response
+    responses[0]['data'].append(4)
+    assert all(response['data'] == [1, 2, 3] for response in responses[1:])
+    assert exchange.requests_in_flight == {}
+
+    # the requests with other params and the private ones are not coalesced
+    await asyncio.gather(
+        exchange.publicGetTicker({'symbol': 'BTC/USDT'}),
+        exchange.publicGetTicker({'symbol': 'ETH/USDT'}),
+        exchange.privateGetBalance(),
+        exchange.privateGetBalance(),
+    )
+    assert sorted(exchange.fetched[1:]) == ['balance?', 'balance?', 'ticker?symbol=BTC%2FUSDT', 'ticker?symbol=ETH%2FUSDT']
+    await exchange.close()
+
+
+async def cancelled_caller():
+    exchange = create_exchange()
+    # a caller that is cancelled does not cancel the request of the others
+    callers = [asyncio.ensure_future(exchange.publicGetTicker({'symbol': 'BTC/USDT'})) for i in range(3)]
+    await asyncio.sleep(0)
+    callers[0].cancel()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1] == results[2] == {'url': 'https://example.com/ticker?symbol=BTC%2FUSDT', 'data': [1, 2, 3]}
+    assert exchange.fetched == ['ticker?symbol=BTC%2FUSDT']
+
+    # the request is completed even if all its callers are cancelled
+    caller = asyncio.ensure_future(exchange.publicGetTicker({'symbol': 'ETH/USDT'}))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.sleep(0.05)
+    assert exchange.fetched == ['ticker?symbol=BTC%2FUSDT', 'ticker?symbol=ETH%2FUSDT']
+    assert exchange.requests_in_flight == {}
+    await exchange.close()
+
+
+asyncio.run(concurrent_callers())
+asyncio.run(cancelled_caller())
+print('coalesced requests tests passed')
@@ -0,0 +1,104 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+
+class Exchange(ccxt.async_support.Exchange):
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'execute_bulk_test',
+            'rateLimit': 10,
+            'api': {
+                'public': {
+                    'get': {
+                        'ticker': 1,
+                    },
+                },
+                'private': {
+                    'get': {
+                        'balance': 1,
+                    },
+                    'post': {
+                        'order': 1,
+                    },
+                },
+            },
+        })
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': 'https://example.com/' + path, 'method': method, 'body': body, 'headers': headers}
+
+    async def fetch(self, url, method='GET', headers=None, body=None, stream=False):
+        self.fetched.append(url[len('https://example.com/'):])
+        return {}
+
+    async def fetch_ticker(self, symbol, params={}):
+        return await self.publicGetTicker(params)
+
+    async def fetch_balance(self, params={}):
+        return await self.privateGetBalance(params)
+
+    async def create_order(self, symbol, type, side, amount, price=None, params={}):
+        return await self.privatePostOrder(params)
+
+    async def fetch_time(self, params={}):
+        await asyncio.sleep(1)
+
+
+async def main():
+    exchange = Exchange({'enableRateLimit': True})
+    exchange.fetched = []
+    exchange.priorities = []
+
+    async def throttle(cost=None, priority=None):
+        exchange.priorities.append(priority)
+
+    exchange.throttle = throttle
+
+    # a concurrency of zero would never run the jobs
+    for concurrency in (0, -1):
+        try:
+            await exchange.execute_bulk([('fetch_ticker', ['BTC/USDT'])], concurrency)
+            assert False
+        except ccxt.BadRequest:
+            pass
+
+    # the jobs start by priority, the names and the numbers can be mixed, the orders go first by default
+    jobs = [
+        ('fetch_ticker', ['BTC/USDT']),
+        {'method': 'fetch_balance', 'args': [], 'priority': 'public'},
+        {'method': 'fetch_ticker', 'args': ['ETH/USDT'], 'priority': 0},
+        ('create_order', ['BTC/USDT', 'limit', 'buy', 1, 1]),
+        {'method': 'fetch_time', 'timeout': 10},
+        ('fetch_unknown', []),
+    ]
+    results = await exchange.execute_bulk(jobs, 1)
+    assert results[:4] == [{}, {}, {}, {}]
+    assert isinstance(results[4], ccxt.RequestTimeout)
+    assert isinstance(results[5], ccxt.NotSupported)
+    assert exchange.fetched == ['ticker', 'order', 'ticker', 'balance']
+
+    # the priority of the job is the priority of its requests in the throttler, the others keep the priority of their endpoint
+    assert exchange.priorities == [0, 0, 2, 2]
+    assert exchange.calculate_rate_limiter_priority('private', 'GET', 'balance') == 1
+    assert exchange.calculate_rate_limiter_priority('private', 'GET', 'balance', {}, {'priority': 'trading'}) == 0
+
+    # an unknown priority name is an error
+    try:
+        await exchange.execute_bulk([{'method': 'fetch_ticker', 'args': ['BTC/USDT'], 'priority': 'urgent'}])
+        assert False
+    except ccxt.BadRequest:
+        pass
+    await exchange.close()
+
+
+asyncio.run(main())
+print('execute bulk tests passed')
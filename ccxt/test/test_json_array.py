@@ -0,0 +1,243 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from multidict import CIMultiDict, CIMultiDictProxy  # noqa: E402
+from ccxt.base.json_codec import iterate_json_array  # noqa: E402
+
+items = [
+    {'symbol': 'BTC/USDT', 'price': '16000.5', 'qty': 0.25},
+    {'text': 'a string with [brackets], "quotes", commas and é'},
+    [1, [2, 3], {}],
+    -12345678901234567890,
+    1.5e-7,
+    None,
+    True,
+]
+body = ' [ ' + ' , '.join(json.dumps(item, ensure_ascii=False) for item in items) + ' ] \n'
+encoded = body.encode('utf-8')
+# the exchanges keep the numbers as strings by default
+quoted_items = json.loads(body, parse_float=str, parse_int=str)
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+decoder = json.JSONDecoder()
+quoted = json.JSONDecoder(parse_float=str, parse_int=str)
+
+# the items are the same whatever the chunk size, even with the numbers and the utf-8 characters cut by the end of a chunk
+for size in (1, 2, 3, 7, 64, len(encoded)):
+    assert list(iterate_json_array(split(encoded, size), decoder)) == items
+assert list(iterate_json_array(split(b'[1, 2.50]', 1), quoted)) == ['1', '2.50']
+assert list(iterate_json_array([b'[]'], decoder)) == []
+assert list(iterate_json_array([b' [ \n ] '], decoder)) == []
+
+# a large item split in many chunks
+large = [{'id': i, 'values': list(range(100))} for i in range(100)]
+assert list(iterate_json_array(split(json.dumps([large]).encode(), 10), decoder)) == [large]
+
+# the malformed and incomplete arrays raise a ValueError
+for malformed in (b'{"a": 1}', b'[1 2]', b'[1, 2', b'[{"a": 1}', b'', b'[1,]'):
+    try:
+        list(iterate_json_array(split(malformed, 2), decoder))
+        assert False, malformed
+    except ValueError:
+        pass
+
+
+def handle_errors(exchange, code, reason, url, method, headers, body, response, requestHeaders, requestBody):
+    # the streamed responses are checked before the items, without their body
+    if 'X-Error' in headers:
+        assert body == '' and response is None
+        raise ccxt.ExchangeNotAvailable(exchange.id + ' ' + headers['X-Error'])
+
+
+class SyncExchange(ccxt.Exchange):
+    id = 'json_array_test'
+    streamChunkSize = 8
+    handle_errors = handle_errors
+
+
+class Response:
+    reason = 'OK'
+
+    def __init__(self, data, status=200, headers={}):
+        self.data = data
+        self.status_code = self.status = status
+        self.headers = dict({'Content-Type': 'application/json'}, **headers)
+        self.closed = False
+
+    # requests
+    def iter_content(self, size):
+        return iter(split(self.data, size))
+
+    def close(self):
+        self.closed = True
+
+    @property
+    def text(self):
+        return self.data.decode()
+
+    def raise_for_status(self):
+        pass
+
+
+class Session:
+    cookies = None
+    headers = {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def request(self, *args, **kwargs):
+        return self.response
+
+
+def sync_fetch(response):
+    exchange = SyncExchange({'session': Session(response)})
+    return exchange.fetch('https://example.com/items', 'GET', None, None, True)
+
+
+response = Response(encoded)
+assert list(sync_fetch(response)) == quoted_items
+assert response.closed
+assert list(sync_fetch(Response(b'[]'))) == []
+
+# a response that is not an array is decoded at once
+assert sync_fetch(Response(b'{"a": [1]}')) == {'a': ['1']}
+
+# the errors are raised before the first item
+response = Response(encoded, 200, {'X-Error': 'maintenance'})
+try:
+    sync_fetch(response)
+    assert False
+except ccxt.ExchangeNotAvailable:
+    assert response.closed
+
+# a malformed array raises a BadResponse while it is iterated
+try:
+    list(sync_fetch(Response(b'[{"a": 1}, {"b" 2}]')))
+    assert False
+except ccxt.BadResponse:
+    pass
+
+
+class Content:
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+        self.reads = 0
+
+    async def read(self, size=-1):
+        size = len(self.data) - self.position if size < 0 else size
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        self.reads += 1
+        return chunk
+
+
+class AsyncResponse:
+    reason = 'OK'
+
+    def __init__(self, data, status=200, headers={}):
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict(dict({'Content-Type': 'application/json'}, **headers)))
+        self.content = Content(data)
+        self.released = False
+
+    async def read(self):
+        return await self.content.read()
+
+    def get_encoding(self):
+        return 'utf-8'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.released = True
+
+
+class AsyncSession:
+    closed = False
+    headers = {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, *args, **kwargs):
+        return self.response
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncExchange(ccxt.async_support.Exchange):
+    id = 'json_array_test'
+    streamChunkSize = 8
+    handle_errors = handle_errors
+
+
+async def async_fetch(response):
+    exchange = AsyncExchange({'session': AsyncSession(response)})
+    try:
+        return await exchange.fetch('https://example.com/items', 'GET', None, None, True)
+    finally:
+        await exchange.close()
+
+
+async def streams():
+    # the body is read in chunks of streamChunkSize and never at once, the items are yielded as soon as they are decoded
+    response = AsyncResponse(encoded)
+    iterator = await async_fetch(response)
+    assert await iterator.__anext__() == quoted_items[0]
+    assert response.content.position < len(encoded) and not response.released
+    assert [item async for item in iterator] == quoted_items[1:]
+    assert response.content.reads >= len(encoded) // AsyncExchange.streamChunkSize
+    assert response.released
+    assert [item async for item in await async_fetch(AsyncResponse(b'[]'))] == []
+    assert await async_fetch(AsyncResponse(b'{"a": [1]}')) == {'a': ['1']}
+    response = AsyncResponse(encoded, 200, {'X-Error': 'maintenance'})
+    try:
+        await async_fetch(response)
+        assert False
+    except ccxt.ExchangeNotAvailable:
+        assert response.content.reads == 1 and response.released
+    for malformed in (b'[{"a": 1}, {"b" 2}]', b'[1, 2, 3'):
+        response = AsyncResponse(malformed)
+        try:
+            [item async for item in await async_fetch(response)]
+            assert False
+        except ccxt.BadResponse:
+            assert response.released
+
+
+asyncio.run(streams())
+
+
+async def last_response_headers():
+    # the headers of the last response are a dict, the repeated headers are joined
+    response = AsyncResponse(b'{}')
+    response.headers = CIMultiDictProxy(CIMultiDict([('Content-Type', 'application/json'), ('Set-Cookie', 'a=1'), ('Set-Cookie', 'b=2')]))
+    exchange = AsyncExchange({'session': AsyncSession(response)})
+    await exchange.fetch('https://example.com/items')
+    # they are copied when they are read, not by every request
+    assert not isinstance(exchange.lastResponseHeadersView, dict)
+    assert exchange.last_response_headers == {'Content-Type': 'application/json', 'Set-Cookie': 'a=1, b=2'}
+    assert exchange.last_response_headers is exchange.last_response_headers
+    exchange.last_response_headers['X-Custom'] = 'value'
+    await exchange.close()
+
+
+asyncio.run(last_response_headers())
+print('json array tests passed')
@@ -0,0 +1,114 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt.async_support  # noqa: E402
+from multidict import CIMultiDict, CIMultiDictProxy  # noqa: E402
+
+
+class Response:
+    reason = 'OK'
+
+    def __init__(self, body, status=200, content_type='application/json'):
+        self.body = body
+        self.status = status
+        self.headers = CIMultiDictProxy(CIMultiDict({'Content-Type': content_type}))
+        self.decoded = False
+
+    async def read(self):
+        return self.body
+
+    def get_encoding(self):
+        # called when the text of the response is materialized
+        self.decoded = True
+        return 'utf-8'
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class Session:
+    closed = False
+    headers = {}
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, *args, **kwargs):
+        return self.response
+
+    async def close(self):
+        self.closed = True
+
+
+class Exchange(ccxt.async_support.Exchange):
+    id = 'json_bytes_test'
+
+    def handle_errors(self, code, reason, url, method, headers, body, response, requestHeaders, requestBody):
+        self.checked = (body, response)
+        if code >= 400 and response is not None:
+            raise ccxt.ExchangeError(self.id + ' ' + response['msg'])
+
+
+class TextExchange(Exchange):
+    def on_rest_response(self, code, reason, url, method, response_headers, response_body, request_headers, request_body):
+        return response_body.replace('1', '2')
+
+
+async def fetch(response, config={}, exchange_class=Exchange):
+    exchange = exchange_class(ccxt.async_support.Exchange.extend({'session': Session(response)}, config))
+    try:
+        return exchange, await exchange.fetch('https://example.com/ticker')
+    finally:
+        await exchange.close()
+
+
+async def main():
+    # the json is decoded from the bytes, the text is never materialized and handle_errors gets an empty body
+    response = Response(b'{"price": 1.5, "ids": [1]}')
+    exchange, result = await fetch(response, {'decodeJsonFromBytes': True, 'enableLastHttpResponse': False})
+    assert result == {'price': '1.5', 'ids': ['1']}
+    assert not response.decoded
+    assert exchange.checked == ('', result)
+    assert exchange.last_json_response == result
+
+    # the numbers are decoded like from the text
+    response = Response(b'[{"price": 1.5}]')
+    exchange, result = await fetch(response, {'decodeJsonFromBytes': True, 'enableLastHttpResponse': False, 'quoteJsonNumbers': False})
+    assert result == [{'price': 1.5}] and not response.decoded
+
+    # it is off by default and the text is still needed by the last http response, the verbose mode,
+    # the error statuses, the other content types and the exchanges that override on_rest_response
+    cases = [
+        ({}, Exchange),
+        ({'decodeJsonFromBytes': True}, Exchange),
+        ({'decodeJsonFromBytes': True, 'enableLastHttpResponse': False, 'verbose': True, 'log': lambda *args: None}, Exchange),
+        ({'decodeJsonFromBytes': True, 'enableLastHttpResponse': False}, TextExchange),
+    ]
+    for config, exchange_class in cases:
+        response = Response(b'{"price": 1}')
+        exchange, result = await fetch(response, config, exchange_class)
+        assert response.decoded
+        assert exchange.checked[0].startswith('{"price": ')
+    response = Response(b'{"msg": "invalid symbol"}', 400)
+    try:
+        await fetch(response, {'decodeJsonFromBytes': True, 'enableLastHttpResponse': False})
+        assert False
+    except ccxt.ExchangeError as e:
+        assert 'invalid symbol' in str(e)
+    assert response.decoded
+    response = Response(b'[1]', 200, 'text/plain')
+    exchange, result = await fetch(response, {'decodeJsonFromBytes': True, 'enableLastHttpResponse': False})
+    assert result == ['1'] and response.decoded
+
+
+asyncio.run(main())
+print('json bytes tests passed')
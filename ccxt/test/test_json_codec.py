@@ -0,0 +1,69 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+from ccxt.base.json_codec import get_json_codec, json_codec_classes, JsonCodec  # noqa: E402
+from ccxt.async_support.base.ws.aiohttp_client import AiohttpClient  # noqa: E402
+
+body = '{"symbol": "BTC/USDT", "price": 16000.50, "amount": 12, "ids": [1, 2], "nested": {"rate": -0.0001}, "text": "é"}'
+decoded = {'symbol': 'BTC/USDT', 'price': 16000.5, 'amount': 12, 'ids': [1, 2], 'nested': {'rate': -0.0001}, 'text': 'é'}
+quoted = {'symbol': 'BTC/USDT', 'price': '16000.50', 'amount': '12', 'ids': ['1', '2'], 'nested': {'rate': '-0.0001'}, 'text': 'é'}
+
+# the codecs are created once, the stdlib one is the default
+assert type(get_json_codec()) is JsonCodec
+assert get_json_codec('json') is get_json_codec()
+
+installed = [name for name, (codec_class, module) in json_codec_classes.items() if module is not None]
+for name, (codec_class, module) in json_codec_classes.items():
+    if module is None:
+        # a codec whose package is not installed cannot be used
+        try:
+            get_json_codec(name)
+            assert False
+        except ImportError:
+            pass
+        continue
+    codec = get_json_codec(name)
+    assert isinstance(codec, codec_class)
+    # every codec decodes the same values from a string or from bytes, the quoted numbers keep their digits
+    assert codec.loads(body) == decoded
+    assert codec.loads(body.encode()) == decoded
+    assert codec.loads_quoted(body) == quoted
+    assert codec.loads_quoted(body.encode()) == quoted
+
+# auto is the fastest one installed
+auto = get_json_codec('auto')
+assert type(auto) is json_codec_classes['orjson' if 'orjson' in installed else 'ujson' if 'ujson' in installed else 'json'][0]
+
+try:
+    get_json_codec('simplejson')
+    assert False
+except ValueError:
+    pass
+
+# the exchanges decode the responses with their codec, an unknown codec is not supported
+for name in installed + ['auto']:
+    exchange = ccxt.Exchange({'id': 'json_codec_test', 'jsonCodec': name})
+    assert exchange.json_decoder is get_json_codec(name)
+    assert exchange.parse_json(body) == quoted
+    exchange.quoteJsonNumbers = False
+    assert exchange.parse_json(body) == decoded
+try:
+    ccxt.Exchange({'id': 'json_codec_test', 'jsonCodec': 'simplejson'})
+    assert False
+except ccxt.NotSupported:
+    pass
+
+# the websocket clients decode the text and the binary json frames with the codec of the exchange
+for name in installed:
+    client = AiohttpClient('wss://example.com', None, None, None, None, {'json_decoder': get_json_codec(name)})
+    assert client.decode_message(body) == decoded
+    assert client.decode_message(body.encode()) == decoded
+    assert client.decode_message('pong') == 'pong'
+    assert client.decode_message(b'pong') == 'pong'
+print('json codec tests passed')
@@ -0,0 +1,41 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+# the exchange modules are imported on first access only
+assert 'ccxt.binance' not in sys.modules
+assert 'binance' in ccxt.exchanges and 'binance' in dir(ccxt)
+assert isinstance(ccxt.binance, type) and issubclass(ccxt.binance, ccxt.Exchange)
+assert 'ccxt.binance' in sys.modules
+assert 'ccxt.kraken' not in sys.modules
+
+# importing a submodule that imports another exchange does not replace the classes with the modules
+import ccxt.binanceusdm  # noqa: E402
+assert isinstance(ccxt.binanceusdm, type) and issubclass(ccxt.binanceusdm, ccxt.binance)
+assert isinstance(ccxt.binance, type)
+from ccxt.kraken import kraken  # noqa: E402
+assert ccxt.kraken is kraken
+
+# the unknown attributes still raise an AttributeError
+try:
+    ccxt.unknown_exchange
+    assert False
+except AttributeError:
+    pass
+
+# the async and pro packages load their exchanges the same way
+import ccxt.async_support  # noqa: E402
+import ccxt.pro  # noqa: E402
+assert 'ccxt.async_support.okx' not in sys.modules and 'ccxt.pro.okx' not in sys.modules
+assert issubclass(ccxt.pro.okx, ccxt.async_support.okx)
+assert 'ccxt.pro.okx' in sys.modules and 'ccxt.async_support.okx' in sys.modules
+import ccxt.pro.binanceusdm  # noqa: E402
+assert isinstance(ccxt.pro.binance, type) and isinstance(ccxt.async_support.binance, type)
+assert set(ccxt.pro.exchanges) <= set(ccxt.async_support.exchanges) == set(ccxt.exchanges)
+print('lazy loading tests passed')
@@ -0,0 +1,89 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import tempfile  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+markets = [
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'baseId': 'BTC', 'quoteId': 'USDT', 'spot': True, 'precision': {'amount': 6, 'price': 2}},
+    {'id': 'ETHUSDT', 'symbol': 'ETH/USDT', 'base': 'ETH', 'quote': 'USDT', 'baseId': 'ETH', 'quoteId': 'USDT', 'spot': True, 'precision': {'amount': 5, 'price': 2}},
+]
+
+
+describe = {
+    'id': 'markets_cache_test',
+    'options': {'fetchMarkets': ['spot']},
+}
+
+
+class SyncExchange(ccxt.Exchange):
+    id = 'markets_cache_test'
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(SyncExchange, self).describe(), describe)
+
+    def fetch_markets(self, params={}):
+        type(self).fetches += 1
+        return [dict(market) for market in markets]
+
+
+directory = tempfile.mkdtemp()
+
+# a cold instance fetches the markets and writes the cache, the next one restores them without fetching
+cold = SyncExchange({'marketsCacheDirectory': directory})
+cold.load_markets()
+assert SyncExchange.fetches == 1
+warm = SyncExchange({'marketsCacheDirectory': directory})
+warm.load_markets()
+assert SyncExchange.fetches == 1
+
+# the restored tables are built by set_markets() like the fetched ones
+assert warm.markets == cold.markets
+assert warm.markets_by_id == cold.markets_by_id
+assert warm.currencies == cold.currencies
+assert warm.symbols == cold.symbols
+assert warm.market('BTC/USDT') is warm.markets['BTC/USDT']
+assert warm.safe_market('BTCUSDT')['symbol'] == 'BTC/USDT'
+
+# the options that do not change the markets do not change the key
+volatile = SyncExchange({'marketsCacheDirectory': directory})
+volatile.options['timeDifference'] = 1234
+assert volatile.markets_cache_key() == cold.markets_cache_key()
+other = SyncExchange({'marketsCacheDirectory': directory, 'options': {'fetchMarkets': ['spot', 'linear']}})
+assert other.markets_cache_key() != cold.markets_cache_key()
+
+
+# a stale cache is used right away and refreshed by a task that the exchange keeps
+class AsyncExchange(ccxt.async_support.Exchange):
+    id = 'markets_cache_test'
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(AsyncExchange, self).describe(), describe)
+
+    async def fetch_markets(self, params={}):
+        type(self).fetches += 1
+        return [dict(market) for market in markets]
+
+
+async def refresh():
+    exchange = AsyncExchange({'marketsCacheDirectory': directory, 'marketsCacheTTL': -1})
+    assert 'BTC/USDT' in await exchange.load_markets()
+    task = exchange.marketsCacheRefresh
+    assert task is not None
+    await task
+    assert AsyncExchange.fetches == 1
+    assert exchange.markets['ETH/USDT']['id'] == 'ETHUSDT'
+    await exchange.close()
+
+
+asyncio.run(refresh())
+print('markets cache tests passed')
@@ -0,0 +1,42 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+url = 'https://api.binance.com/api/v3/ticker/price'
+
+
+def used_weight(exchange, weight):
+    exchange.handle_rate_limit_headers(200, 'OK', url, 'GET', {'X-MBX-USED-WEIGHT-1M': str(weight)})
+    return exchange.throttle.bucket.available()
+
+
+# the current minute is half over, the rate limiter would refill 600 tokens of 1200 until its end
+exchange = ccxt.binance({'enableRateLimit': True})
+exchange.milliseconds = lambda: 30000
+start = exchange.throttle.bucket.available()
+
+# a low used weight leaves more than the rate limiter would spend, the tokens are not raised
+assert abs(used_weight(exchange, 10) - start) < 1
+
+# a high used weight only leaves 10 for the rest of the minute
+assert abs(used_weight(exchange, 1190) + 590) < 1
+
+# a concurrent response that was sent before the last one reports a lower weight, it does not give back the tokens
+assert abs(used_weight(exchange, 100) + 590) < 1
+assert abs(used_weight(exchange, 1200) + 600) < 1
+
+# the responses of the apis without a used weight header are ignored
+exchange.handle_rate_limit_headers(200, 'OK', 'https://api.binance.com/other/v1/time', 'GET', {'X-MBX-USED-WEIGHT-1M': '0'})
+assert abs(exchange.throttle.bucket.available() + 600) < 1
+
+# a 429 response pauses for its Retry-After
+exchange = ccxt.binance({'enableRateLimit': True})
+exchange.handle_rate_limit_headers(429, 'Too Many Requests', url, 'GET', {'Retry-After': '3'})
+assert abs(exchange.throttle.bucket.available() + 3000 / 50) < 1
+print('rate limit headers tests passed')
@@ -0,0 +1,123 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+import ccxt  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+
+describe = {
+    'id': 'response_cache_test',
+    'api': {
+        'public': {
+            'get': {
+                'markets': {'cost': 1, 'ttl': 60000},
+                'ticker': 1,
+            },
+        },
+    },
+}
+
+
+def markets(fetch):
+    return [{'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'baseId': 'BTC', 'quoteId': 'USDT', 'spot': True, 'info': {'fetch': fetch}}]
+
+
+class SyncExchange(ccxt.Exchange):
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(SyncExchange, self).describe(), describe)
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': 'https://example.com/' + path, 'method': method, 'body': body, 'headers': headers}
+
+    def fetch(self, url, method='GET', headers=None, body=None, stream=False):
+        type(self).fetches += 1
+        return markets(self.fetches)
+
+    def fetch_markets(self, params={}):
+        return self.publicGetMarkets(params)
+
+
+# the endpoints with a ttl are fetched once, the others every time
+exchange = SyncExchange({'responseCacheBackend': 'memory'})
+first = exchange.publicGetMarkets()
+second = exchange.publicGetMarkets()
+assert SyncExchange.fetches == 1
+assert first == second
+exchange.publicGetTicker()
+exchange.publicGetTicker()
+assert SyncExchange.fetches == 3
+
+# every caller gets its own copy, a caller that modifies a response does not change the cached one
+first[0]['symbol'] = 'modified'
+second[0]['info']['fetch'] = 'modified'
+third = exchange.publicGetMarkets()
+assert third[0]['symbol'] == 'BTC/USDT'
+assert third[0]['info']['fetch'] == 1
+assert exchange.response_cache.stats() == {'size': 1, 'hits': 2, 'misses': 1, 'evictions': 0}
+
+# the markets are read from the cache unless they are reloaded, the reload replaces the cached response
+exchange.load_markets()
+assert SyncExchange.fetches == 3
+assert exchange.markets['BTC/USDT']['info']['fetch'] == 1
+exchange.load_markets(True)
+assert SyncExchange.fetches == 4
+assert exchange.markets['BTC/USDT']['info']['fetch'] == 4
+assert exchange.publicGetMarkets()[0]['info']['fetch'] == 4
+
+# the cache is disabled by default
+exchange = SyncExchange()
+exchange.publicGetMarkets()
+exchange.publicGetMarkets()
+assert SyncExchange.fetches == 6
+
+
+class AsyncExchange(ccxt.async_support.Exchange):
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(AsyncExchange, self).describe(), describe)
+
+    def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
+        return {'url': 'https://example.com/' + path, 'method': method, 'body': body, 'headers': headers}
+
+    async def fetch(self, url, method='GET', headers=None, body=None, stream=False):
+        type(self).fetches += 1
+        return markets(self.fetches)
+
+    async def fetch_markets(self, params={}):
+        return await self.publicGetMarkets(params)
+
+
+async def reload():
+    exchange = AsyncExchange({'responseCacheBackend': 'memory'})
+    await exchange.load_markets()
+    await exchange.publicGetMarkets()
+    assert AsyncExchange.fetches == 1
+    await exchange.load_markets(True)
+    assert AsyncExchange.fetches == 2
+    assert exchange.markets['BTC/USDT']['info']['fetch'] == 2
+    await exchange.close()
+
+
+asyncio.run(reload())
+
+# only the public reference data is cached by the exchanges, binance does not sign its sapi system/status
+for exchange in (ccxt.binance(), ccxt.bybit()):
+    cached = 0
+    for api, methods in exchange.api.items():
+        for method, endpoints in methods.items() if isinstance(methods, dict) else []:
+            for path, config in endpoints.items() if isinstance(endpoints, dict) else []:
+                if isinstance(config, dict) and 'ttl' in config:
+                    public = 'public' in api.lower() or (api, path) == ('sapi', 'system/status')
+                    assert method == 'get' and public, exchange.id + ' ' + api + ' ' + path
+                    cached += 1
+    assert cached > 0
+print('response cache tests passed')
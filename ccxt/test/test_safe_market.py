@@ -0,0 +1,30 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+exchange = ccxt.Exchange({'id': 'safe_market_test'})
+exchange.set_markets([
+    {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'baseId': 'BTC', 'quoteId': 'USDT', 'type': 'spot', 'spot': True},
+])
+
+assert exchange.safe_market('BTCUSDT')['symbol'] == 'BTC/USDT'
+
+# the markets of the unknown ids split by a delimiter are cached, a caller that modifies one does not change the next ones
+first = exchange.safe_market('ETH_EUR', None, '_')
+assert first['symbol'] == 'ETH/EUR'
+first['symbol'] = 'modified'
+first['type'] = 'modified'
+second = exchange.safe_market('ETH_EUR', None, '_')
+assert second is not first
+assert second['symbol'] == 'ETH/EUR'
+assert second['type'] is None
+
+# the unknown ids without a delimiter are not split
+assert exchange.safe_market('UNKNOWN')['symbol'] == 'UNKNOWN'
+print('safe market tests passed')
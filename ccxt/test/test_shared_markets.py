@@ -0,0 +1,45 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import ccxt  # noqa: E402
+
+
+class Exchange(ccxt.Exchange):
+    fetches = 0
+
+    def describe(self):
+        return self.deep_extend(super(Exchange, self).describe(), {
+            'id': 'shared_markets_test',
+        })
+
+    def fetch_markets(self, params={}):
+        type(self).fetches += 1
+        return [
+            {'id': 'BTCUSDT', 'symbol': 'BTC/USDT', 'base': 'BTC', 'quote': 'USDT', 'baseId': 'BTC', 'quoteId': 'USDT', 'spot': True},
+        ]
+
+
+# the instances do not share their markets by default, each one loads its own
+assert Exchange().shareMarkets is False
+Exchange().load_markets()
+Exchange().load_markets()
+assert Exchange.fetches == 2
+assert not any(key[0] is Exchange for key in ccxt.Exchange.shared_markets)
+
+# with shareMarkets the first instance publishes the markets and the next ones reuse them
+first = Exchange({'shareMarkets': True})
+first.load_markets()
+second = Exchange({'shareMarkets': True})
+second.load_markets()
+assert Exchange.fetches == 3
+assert second.markets is first.markets
+
+# a default instance does not read the published markets either
+Exchange().load_markets()
+assert Exchange.fetches == 4
+print('shared markets tests passed')
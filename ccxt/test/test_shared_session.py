@@ -0,0 +1,94 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import aiohttp  # noqa: E402
+import asyncio  # noqa: E402
+import ccxt.async_support  # noqa: E402
+
+
+class Session:
+    def __init__(self, shared):
+        self.closed = False
+        self.shared = shared
+
+    async def close(self):
+        self.closed = True
+
+
+class Exchange(ccxt.async_support.Exchange):
+    id = 'shared_session_test'
+
+    def create_session(self, shared=False):
+        return Session(shared)
+
+
+async def main():
+    # the key of the shared session is not replaced by the alias of a method
+    assert Exchange().sharedSessionKey is None
+    assert Exchange({'shareSession': True}).session_sharing_key() == Exchange({'shareSession': True}).sessionSharingKey()
+
+    # the instances without shareSession have their own session, closed by close()
+    first = Exchange()
+    second = Exchange()
+    first.open()
+    second.open()
+    assert first.session is not second.session
+    assert not first.session.shared
+    session = first.session
+    await first.close()
+    assert session.closed and first.session is None
+    await second.close()
+
+    # the instances with shareSession use one session, the last one closes it
+    instances = [Exchange({'shareSession': True}) for i in range(3)]
+    for instance in instances:
+        instance.open()
+    session = instances[0].session
+    assert all(instance.session is session for instance in instances)
+    assert session.shared
+    key = instances[0].sharedSessionKey
+    assert Exchange.sharedSessions[key]['users'] == 3
+    await instances[0].close()
+    await instances[1].close()
+    assert not session.closed
+    assert Exchange.sharedSessions[key]['users'] == 1
+    # closing twice does not release the session of the other instances
+    await instances[0].close()
+    assert Exchange.sharedSessions[key]['users'] == 1
+    await instances[2].close()
+    assert session.closed
+    assert key not in Exchange.sharedSessions
+
+    # a new session is created once the shared one is closed
+    instance = Exchange({'shareSession': True})
+    instance.open()
+    assert instance.session is not session
+    await instance.close()
+
+    # the instances with another connector config do not share the session
+    first = Exchange({'shareSession': True})
+    second = Exchange({'shareSession': True, 'aiohttpConnector': {'limit': 10}})
+    first.open()
+    second.open()
+    assert first.session is not second.session
+    await first.close()
+    await second.close()
+
+    # the cookies of the shared sessions are not stored
+    instance = ccxt.async_support.Exchange({'shareSession': True})
+    instance.open()
+    assert isinstance(instance.session.cookie_jar, aiohttp.DummyCookieJar)
+    await instance.close()
+    instance = ccxt.async_support.Exchange()
+    instance.open()
+    assert not isinstance(instance.session.cookie_jar, aiohttp.DummyCookieJar)
+    await instance.close()
+
+
+asyncio.run(main())
+print('shared session tests passed')
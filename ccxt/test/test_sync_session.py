@@ -0,0 +1,110 @@
+import os
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(root)
+
+# ----------------------------------------------------------------------------
+
+import threading  # noqa: E402
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # noqa: E402
+import ccxt  # noqa: E402
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, the connections are reused by the pool
+    failures = 0  # the requests that get a 503 before the next 200
+    requests = []
+
+    def respond(self):
+        Handler.requests.append((self.command, self.client_address[1]))
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if Handler.failures > 0:
+            Handler.failures -= 1
+            status, body = 503, b'{"error": "unavailable"}'
+        else:
+            status, body = 200, b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=1; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = respond
+    do_POST = respond
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = 'http://127.0.0.1:' + str(server.server_address[1]) + '/'
+
+
+class Exchange(ccxt.Exchange):
+    id = 'sync_session_test'
+
+
+# the adapter is sized by requestsAdapter, the requests are not retried by default
+exchange = Exchange({'requestsAdapter': {'pool_maxsize': 4}})
+adapter = exchange.session.get_adapter(url)
+assert adapter._pool_connections == 10 and adapter._pool_maxsize == 4 and not adapter._pool_block
+assert adapter.max_retries.total == 0
+
+# the threads that share an instance reuse the connections of the pool, the cookies are not stored
+Handler.requests = []
+
+
+def fetch_many():
+    for i in range(5):
+        assert exchange.fetch(url) == {'ok': True}
+
+
+threads = [threading.Thread(target=fetch_many) for i in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+assert len(Handler.requests) == 20
+assert len(set(port for method, port in Handler.requests)) <= 4
+assert len(exchange.session.cookies) == 0
+
+# without retries a 503 is raised
+Handler.failures = 1
+try:
+    exchange.fetch(url)
+    assert False
+except ccxt.ExchangeNotAvailable:
+    pass
+
+# with requestsRetry the idempotent requests are retried on 502, 503 and 504, the other ones are not
+exchange = Exchange({'requestsRetry': {'backoff_factor': 0}})
+retry = exchange.session.get_adapter(url).max_retries
+assert retry.total == 3 and set(retry.status_forcelist) == {502, 503, 504}
+Handler.requests = []
+Handler.failures = 2
+assert exchange.fetch(url) == {'ok': True}
+assert [method for method, port in Handler.requests] == ['GET', 'GET', 'GET']
+Handler.requests = []
+Handler.failures = 1
+try:
+    exchange.fetch(url, 'POST', None, '{}')
+    assert False
+except ccxt.ExchangeNotAvailable:
+    pass
+assert [method for method, port in Handler.requests] == ['POST']
+
+# the last response is handled as usual once the retries are exhausted
+Handler.failures = 4
+try:
+    exchange.fetch(url)
+    assert False
+except ccxt.ExchangeNotAvailable:
+    pass
+assert Handler.failures == 0
+assert Exchange({'requestsRetry': True}).session.get_adapter(url).max_retries.backoff_factor == 0.5
+
+server.shutdown()
+print('sync session tests passed')
@@ -8,11 +8,15 @@ sys.path.append(root)
 
 import asyncio  # noqa: E402
 import time  # noqa: E402
+import threading  # noqa: E402
 from ccxt.async_support.base.throttler import Throttler as Throttle  # noqa: E402
+import tempfile  # noqa: E402
+from ccxt.base.throttler import Throttler as SyncThrottle, TokenBucket, FileTokenBucket  # noqa: E402
 # from ccxt.async_support.base.throttle import throttle as Throttle
 
 
 delta = 10
+sync_delta = 50
 
 test_cases = [
     {
@@ -106,11 +110,100 @@ async def schedule(case):
 
 
 async def main():
-    await asyncio.wait([schedule(case) for case in test_cases], return_when=asyncio.ALL_COMPLETED)
+    await asyncio.wait([asyncio.ensure_future(schedule(case)) for case in test_cases], return_when=asyncio.ALL_COMPLETED)
 
 
 asyncio.run(main())
 
+
+async def priorities():
+    # a waiter of a lower priority number queued behind others is released before them
+    throttle = Throttle({'refillRate': 0.1})
+    released = []
+
+    async def wait(name, priority):
+        await throttle(1, priority)
+        released.append(name)
+
+    tasks = [asyncio.ensure_future(wait('public' + str(i), 2)) for i in range(5)]
+    await asyncio.sleep(0.005)
+    tasks.append(asyncio.ensure_future(wait('trading', 0)))
+    await asyncio.gather(*tasks)
+    print('priorities released', released)
+    assert released.index('trading') <= 2
+
+
+asyncio.run(priorities())
+
+
+async def stats():
+    throttle = Throttle({'tokens': 2, 'refillRate': 1 / 10, 'capacity': 2})
+    assert throttle.stats() == {'queued': 0, 'released': 0, 'tokens': 2, 'averageWaitTime': 0, 'maxWaitTime': 0}
+    # the fourth request waits for the debt of the third one to be refilled
+    for i in range(4):
+        await throttle(1)
+    result = throttle.stats()
+    assert result['queued'] == 0
+    assert result['released'] == 4
+    assert -2 < result['tokens'] < 0
+    assert abs(result['maxWaitTime'] - 10) < delta / 2
+    assert 0 < result['averageWaitTime'] <= result['maxWaitTime']
+
+
+asyncio.run(stats())
+
+
+async def file_bucket():
+    # two throttlers with the same file share the tokens, the file is locked in an executor
+    path = os.path.join(tempfile.mkdtemp(), 'test.bucket')
+    throttles = [Throttle({}, None, FileTokenBucket(path, {'tokens': 0, 'refillRate': 1 / 10})) for i in range(2)]
+    start = time.perf_counter_ns()
+    await asyncio.gather(*[throttle(1) for throttle in throttles for i in range(5)])
+    elapsed_ms = (time.perf_counter_ns() - start) / 1000000
+    print(f'file bucket finished in {elapsed_ms}ms expected 90ms')
+    assert abs(elapsed_ms - 90) < delta * 2
+
+
+if os.name != 'nt':  # FileTokenBucket requires fcntl
+    asyncio.run(file_bucket())
+
+
+def schedule_sync(case, threads=1):
+    bucket = TokenBucket.shared(('test', case['number'], threads), {
+        'tokens': case['tokens'],
+        'refillRate': case['refillRate'],
+    })
+
+    def run(runs):
+        # each thread has its own throttler and they all use the same shared bucket
+        throttle = SyncThrottle({}, bucket)
+        for i in range(runs):
+            throttle(case['cost'])
+
+    # the runs are split between the threads, the total time is the same
+    workers = [threading.Thread(target=run, args=(case['runs'] // threads + (1 if i < case['runs'] % threads else 0),)) for i in range(threads)]
+    start = time.perf_counter_ns()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    end = time.perf_counter_ns()
+    elapsed_ms = (end - start) / 1000000
+    # the bucket never lets the threads finish early, but up to 50 threads run these cases at once and one of them
+    # can wake up late while the others hold the GIL, so the total time is only checked for lateness with a wider margin
+    result = -delta < elapsed_ms - case['expected'] < sync_delta
+    print(f'sync case {case["number"]} with {threads} threads {"succeeded" if result else "failed"} in {elapsed_ms}ms expected {case["expected"]}ms')
+    results.append(result)
+
+
+results = []
+cases = [threading.Thread(target=schedule_sync, args=(case, threads)) for case in test_cases for threads in (1, 4)]
+for case in cases:
+    case.start()
+for case in cases:
+    case.join()
+assert all(results)
+
 # output
 
 '''